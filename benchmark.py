@@ -3,83 +3,233 @@
 Runs analysis on test projects and records timing/memory metrics.
 """
 
+import argparse
+import io
+import multiprocessing
+import os
+import resource
+import sys
 import time
 import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from code_analyzer.analyzer import CodeAnalyzer
+from code_analyzer.ast_cache import DEFAULT_CACHE_DIR
 
 
-def benchmark_project(project_path: str, project_name: str, depth: str = "shallow"):
-    """Benchmark a single project."""
-    print(f"\n{'='*60}")
-    print(f"Benchmarking: {project_name}")
-    print(f"Path: {project_path}")
-    print(f"Depth: {depth}")
-    print(f"{'='*60}")
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
+MEMORY_METRIC = "USS growth" if HAS_PSUTIL else "Peak RSS growth"
+
+
+def _peak_rss_mb(who: int = resource.RUSAGE_SELF) -> float:
+    """Return the peak resident set size in MB.
+    
+    With ``RUSAGE_CHILDREN`` this is the peak of the largest child process
+    that has exited, such as the analyzer's worker processes.
+    """
+    peak = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes on Linux
+    if sys.platform == "darwin":
+        return peak / 1024 / 1024
+    return peak / 1024
+
+
+def _memory_mb() -> float:
+    """Return the primary memory figure of this process in MB.
+
+    Uses the unique set size (memory that would be freed if the process
+    exited) when psutil is installed. Unlike tracemalloc it does not depend
+    on how the allocator or extension modules account for their memory.
+    Falls back to the kernel's peak RSS counter otherwise.
+    """
+    if HAS_PSUTIL:
+        return psutil.Process().memory_full_info().uss / 1024 / 1024
+    return _peak_rss_mb()
+
+
+def _run_isolated(project_path: str, project_name: str, depth: str = "shallow",
+                  detailed_memory: bool = False, workers: int = 1,
+                  use_cache: bool = True):
+    """Run benchmark_project in a freshly spawned interpreter.
+    
+    The kernel's peak RSS counter only ever grows over a process's lifetime,
+    so a run in a reused process would report almost no growth. A new
+    process per run gives each project its own baseline and peak.
+    """
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(benchmark_project, project_path, project_name, depth,
+                               detailed_memory, workers, use_cache).result()
+
+
+def benchmark_project(project_path: str, project_name: str, depth: str = "shallow",
+                      detailed_memory: bool = False, workers: int = 1,
+                      use_cache: bool = True):
+    """Benchmark a single project.
+
+    The report is built in memory and written to stdout in one call, so
+    output from the analyzer's worker processes can't interleave with it.
+
+    Memory is measured as the growth of the process USS (or peak RSS without
+    psutil), which costs nothing during the run. With more than one worker
+    the peak RSS of the largest worker process is reported as well. tracemalloc hooks every
+    allocation and slows the analysis down noticeably, so its figure is only
+    collected with ``detailed_memory`` and kept as a secondary column.
+    """
+    buf = io.StringIO()
+    buf.write(f"\n{'='*60}\n")
+    buf.write(f"Benchmarking: {project_name}\n")
+    buf.write(f"Path: {project_path}\n")
+    buf.write(f"Depth: {depth}\n")
+    buf.write(f"Workers: {workers}\n")
+    buf.write(f"Cache: {'on' if use_cache else 'off'}\n")
+    buf.write(f"{'='*60}\n")
     
     # Start timing and memory tracking
-    tracemalloc.start()
-    start_time = time.time()
+    if detailed_memory:
+        tracemalloc.start()
+    memory_before = _memory_mb()
+    start_ns = time.perf_counter_ns()
     
     try:
         # Run analysis
-        analyzer = CodeAnalyzer(project_path)
-        result = analyzer.analyze(depth=depth)
+        # Reuse one analyzer per process; only the project binding changes
+        analyzer = CodeAnalyzer.shared(DEFAULT_CACHE_DIR if use_cache else None)
+        analyzer.set_project(project_path)
+        result = analyzer.analyze(depth=depth, workers=workers)
         
-        # Get metrics
-        end_time = time.time()
-        current, peak = tracemalloc.get_traced_memory()
-        tracemalloc.stop()
+        # Stop the clock before touching anything else
+        end_ns = time.perf_counter_ns()
+        growth_mb = _memory_mb() - memory_before
+        worker_peak_mb = None
+        if workers != 1:
+            worker_peak_mb = _peak_rss_mb(resource.RUSAGE_CHILDREN)
+        traced_peak_mb = None
+        if detailed_memory:
+            _, traced_peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            traced_peak_mb = traced_peak / 1024 / 1024
         
         # Calculate results
-        duration = end_time - start_time
-        peak_mb = peak / 1024 / 1024
+        duration = (end_ns - start_ns) / 1e9
+        metrics = result.metrics
+        files_per_sec = metrics.total_files / duration
+        lines_per_sec = metrics.total_lines / duration
         
-        # Print results
-        print(f"\n✅ SUCCESS")
-        print(f"\nTiming:")
-        print(f"  Duration: {duration:.2f}s")
-        print(f"  Files/sec: {result.metrics.total_files / duration:.1f}")
+        # Report results
+        buf.write("\n✅ SUCCESS\n")
+        buf.write("\nTiming:\n")
+        buf.write(f"  Duration: {duration:.2f}s\n")
+        buf.write(f"  Files/sec: {files_per_sec:.1f}\n")
         
-        print(f"\nMemory:")
-        print(f"  Peak: {peak_mb:.1f} MB")
-        print(f"  Per file: {peak_mb / max(result.metrics.total_files, 1):.2f} MB")
+        buf.write("\nMemory:\n")
+        buf.write(f"  {MEMORY_METRIC}: {growth_mb:.1f} MB\n")
+        buf.write(f"  Per file: {growth_mb / max(metrics.total_files, 1):.2f} MB\n")
+        if worker_peak_mb is not None:
+            buf.write(f"  Worker peak RSS: {worker_peak_mb:.1f} MB\n")
+        if traced_peak_mb is not None:
+            buf.write(f"  tracemalloc peak: {traced_peak_mb:.1f} MB\n")
         
-        print(f"\nCode Metrics:")
-        print(f"  Files: {result.metrics.total_files}")
-        print(f"  Lines: {result.metrics.total_lines:,}")
-        print(f"  Classes: {result.metrics.total_classes}")
-        print(f"  Functions: {result.metrics.total_functions}")
-        print(f"  Complexity: {result.metrics.average_complexity:.2f} avg")
+        buf.write("\nCode Metrics:\n")
+        buf.write(f"  Files: {metrics.total_files}\n")
+        buf.write(f"  Lines: {metrics.total_lines:,}\n")
+        buf.write(f"  Classes: {metrics.total_classes}\n")
+        buf.write(f"  Functions: {metrics.total_functions}\n")
+        buf.write(f"  Complexity: {metrics.average_complexity:.2f} avg\n")
         
-        print(f"\nAnalysis Results:")
-        print(f"  Modules: {len(result.modules)}")
-        print(f"  Issues: {len(result.issues)}")
-        print(f"  Critical sections: {len(result.critical_sections)}")
+        buf.write("\nAnalysis Results:\n")
+        buf.write(f"  Modules: {len(result.modules)}\n")
+        buf.write(f"  Issues: {len(result.issues)}\n")
+        buf.write(f"  Critical sections: {len(result.critical_sections)}\n")
         
         return {
             'project': project_name,
             'success': True,
+            'workers': workers,
             'duration': duration,
-            'peak_memory_mb': peak_mb,
-            'files': result.metrics.total_files,
-            'lines': result.metrics.total_lines,
-            'files_per_sec': result.metrics.total_files / duration,
-            'lines_per_sec': result.metrics.total_lines / duration,
+            'memory_growth_mb': growth_mb,
+            'worker_peak_rss_mb': worker_peak_mb,
+            'tracemalloc_peak_mb': traced_peak_mb,
+            'files': metrics.total_files,
+            'lines': metrics.total_lines,
+            'files_per_sec': files_per_sec,
+            'lines_per_sec': lines_per_sec,
         }
         
     except Exception as e:
-        print(f"\n❌ FAILED: {e}")
-        tracemalloc.stop()
+        buf.write(f"\n❌ FAILED: {e}\n")
+        if detailed_memory:
+            tracemalloc.stop()
         return {
             'project': project_name,
             'success': False,
             'error': str(e)
         }
+    
+    finally:
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
+
+
+def sweep_workers(project_path: str, project_name: str) -> int:
+    """Benchmark one project at several worker counts and pick the fastest.
+    
+    Throughput usually rises with the worker count up to a CPU-dependent
+    optimum, then flattens or drops once processes oversubscribe the cores.
+    The cache is disabled so every run does the full analysis.
+    
+    Args:
+        project_path: Project used as the representative workload
+        project_name: Display name for the project
+        
+    Returns:
+        Worker count with the highest files/sec
+    """
+    cpu_count = os.cpu_count() or 1
+    counts = sorted({w for w in (1, 2, 4, 8) if w <= cpu_count} | {cpu_count})
+    
+    sweep = []
+    for workers in counts:
+        result = _run_isolated(project_path, f"{project_name} [workers={workers}]",
+                               "shallow", workers=workers, use_cache=False)
+        if result['success']:
+            sweep.append(result)
+    
+    if not sweep:
+        return 1
+    
+    best = max(sweep, key=lambda r: r['files_per_sec'])
+    
+    buf = io.StringIO()
+    buf.write(f"\nWorker sweep on {project_name}:\n")
+    buf.write(f"  {'Workers':>7}  {'Time (s)':>9}  {'Files/sec':>10}\n")
+    for r in sweep:
+        marker = "  <- optimal" if r is best else ""
+        buf.write(f"  {r['workers']:>7}  {r['duration']:>9.2f}  {r['files_per_sec']:>10.1f}{marker}\n")
+    sys.stdout.write(buf.getvalue())
+    sys.stdout.flush()
+    
+    return best['workers']
 
 
 def main():
     """Run benchmarks on test projects."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--detailed-memory", "--debug-alloc", action="store_true",
+                        help="Also trace allocations with tracemalloc (slows analysis down)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Processes used to analyze files within each project")
+    parser.add_argument("--sweep", action="store_true",
+                        help="Pick --workers by sweeping worker counts on the first project")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Disable the per-file result cache to measure cold runs")
+    args = parser.parse_args()
+    
     print("\n" + "="*60)
     print("CODE-ANALYZER PERFORMANCE BENCHMARKS")
     print("="*60)
@@ -94,53 +244,78 @@ def main():
     
     results = []
     
-    # Run benchmarks
-    for project_path, project_name in projects:
-        if Path(project_path).exists():
-            result = benchmark_project(project_path, project_name, depth="shallow")
-            results.append(result)
+    # Probe all project paths at once; stat() on mounted volumes can be slow
+    # and releases the GIL, so threads overlap the waits
+    with ThreadPoolExecutor(max_workers=len(projects)) as executor:
+        exists = list(executor.map(lambda project: Path(project[0]).exists(), projects))
+    
+    available = []
+    for (project_path, project_name), found in zip(projects, exists):
+        if found:
+            available.append((project_path, project_name))
         else:
             print(f"\n⚠️  Skipping {project_name} - path not found")
     
+    # Find the fastest worker count on a representative project
+    if available and args.sweep:
+        args.workers = sweep_workers(*available[0])
+    
+    # Run benchmarks one project at a time, so each duration is measured
+    # without the other projects competing for the CPU
+    for project_path, project_name in available:
+        results.append(_run_isolated(project_path, project_name, "shallow",
+                                     args.detailed_memory, args.workers,
+                                     not args.no_cache))
+    
     # Print summary
-    print(f"\n\n{'='*60}")
-    print("SUMMARY")
-    print(f"{'='*60}")
+    buf = io.StringIO()
+    buf.write(f"\n\n{'='*60}\n")
+    buf.write("SUMMARY\n")
+    buf.write(f"{'='*60}\n")
     
     successful = [r for r in results if r.get('success')]
     
     if successful:
-        print(f"\nProjects analyzed: {len(successful)}")
-        
-        total_files = sum(r['files'] for r in successful)
-        total_lines = sum(r['lines'] for r in successful)
-        total_time = sum(r['duration'] for r in successful)
-        avg_memory = sum(r['peak_memory_mb'] for r in successful) / len(successful)
+        buf.write(f"\nProjects analyzed: {len(successful)}\n")
+        buf.write(f"Workers per project: {args.workers}\n")
         
-        print(f"\nTotals:")
-        print(f"  Files: {total_files}")
-        print(f"  Lines: {total_lines:,}")
-        print(f"  Time: {total_time:.2f}s")
-        print(f"  Avg memory: {avg_memory:.1f} MB")
+        # Totals and fastest/slowest in a single pass
+        total_files = total_lines = 0
+        total_time = total_memory = 0.0
+        fastest = slowest = successful[0]
+        for r in successful:
+            total_files += r['files']
+            total_lines += r['lines']
+            total_time += r['duration']
+            total_memory += r['memory_growth_mb']
+            if r['duration'] < fastest['duration']:
+                fastest = r
+            if r['duration'] > slowest['duration']:
+                slowest = r
+        avg_memory = total_memory / len(successful)
         
-        print(f"\nThroughput:")
-        print(f"  Files/sec: {total_files / total_time:.1f}")
-        print(f"  Lines/sec: {total_lines / total_time:,.0f}")
+        buf.write("\nTotals:\n")
+        buf.write(f"  Files: {total_files}\n")
+        buf.write(f"  Lines: {total_lines:,}\n")
+        buf.write(f"  Time: {total_time:.2f}s\n")
+        buf.write(f"  Avg {MEMORY_METRIC}: {avg_memory:.1f} MB\n")
         
-        print(f"\nPer-project averages:")
-        print(f"  Duration: {total_time / len(successful):.2f}s")
-        print(f"  Memory: {avg_memory:.1f} MB")
+        buf.write("\nThroughput:\n")
+        buf.write(f"  Files/sec: {total_files / total_time:.1f}\n")
+        buf.write(f"  Lines/sec: {total_lines / total_time:,.0f}\n")
         
-        # Find fastest/slowest
-        fastest = min(successful, key=lambda r: r['duration'])
-        slowest = max(successful, key=lambda r: r['duration'])
+        buf.write("\nPer-project averages:\n")
+        buf.write(f"  Duration: {total_time / len(successful):.2f}s\n")
+        buf.write(f"  {MEMORY_METRIC}: {avg_memory:.1f} MB\n")
         
-        print(f"\nFastest: {fastest['project']} ({fastest['duration']:.2f}s)")
-        print(f"Slowest: {slowest['project']} ({slowest['duration']:.2f}s)")
+        buf.write(f"\nFastest: {fastest['project']} ({fastest['duration']:.2f}s)\n")
+        buf.write(f"Slowest: {slowest['project']} ({slowest['duration']:.2f}s)\n")
     
-    print(f"\n{'='*60}")
-    print("Benchmark complete!")
-    print(f"{'='*60}\n")
+    buf.write(f"\n{'='*60}\n")
+    buf.write("Benchmark complete!\n")
+    buf.write(f"{'='*60}\n\n")
+    sys.stdout.write(buf.getvalue())
+    sys.stdout.flush()
 
 
 if __name__ == "__main__":
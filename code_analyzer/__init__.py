@@ -2,28 +2,51 @@
 
 __version__ = "0.1.0"
 
-from .analyzer import CodeAnalyzer
-from .models import AnalysisResult, CodeLocation, Issue, IssueType, IssueSeverity
-from .plugins import AnalyzerPlugin, CustomRulePlugin, PluginManager
-from .code_library import (
-    CodeLibrary, CodeExample, CodeQuality, PatternType, 
-    PatternMatcher, create_default_library
-)
-
-__all__ = [
-    "CodeAnalyzer",
-    "AnalysisResult",
-    "CodeLocation",
-    "Issue",
-    "IssueType",
-    "IssueSeverity",
-    "AnalyzerPlugin",
-    "CustomRulePlugin",
-    "PluginManager",
-    "CodeLibrary",
-    "CodeExample",
-    "CodeQuality",
-    "PatternType",
-    "PatternMatcher",
-    "create_default_library",
-]
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .analyzer import CodeAnalyzer
+    from .models import AnalysisResult, CodeLocation, Issue, IssueType, IssueSeverity
+    from .plugins import AnalyzerPlugin, CustomRulePlugin, PluginManager
+    from .code_library import (
+        CodeLibrary, CodeExample, CodeQuality, PatternType,
+        PatternMatcher, create_default_library
+    )
+
+# Public names and the submodule defining each. Submodules are imported on
+# first attribute access (PEP 562) so importing the package stays cheap.
+_LAZY_IMPORTS = {
+    "CodeAnalyzer": ".analyzer",
+    "AnalysisResult": ".models",
+    "CodeLocation": ".models",
+    "Issue": ".models",
+    "IssueType": ".models",
+    "IssueSeverity": ".models",
+    "AnalyzerPlugin": ".plugins",
+    "CustomRulePlugin": ".plugins",
+    "PluginManager": ".plugins",
+    "CodeLibrary": ".code_library",
+    "CodeExample": ".code_library",
+    "CodeQuality": ".code_library",
+    "PatternType": ".code_library",
+    "PatternMatcher": ".code_library",
+    "create_default_library": ".code_library",
+}
+
+__all__ = tuple(_LAZY_IMPORTS)
+
+
+def __getattr__(name):
+    """Import public names from their submodule on first access."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """List module attributes including not-yet-imported public names."""
+    return sorted(set(globals()) | set(__all__))
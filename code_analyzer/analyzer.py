@@ -1,44 +1,175 @@
 """Core code analyzer implementation using AST."""
 
 import ast
+import functools
 import os
+import re
+from sys import intern
+from collections import deque
+from itertools import islice, repeat
 from pathlib import Path
-from typing import List, Dict, Set, Optional
+from typing import TYPE_CHECKING, List, Dict, Set, Optional, Tuple
 from datetime import datetime
-from radon.complexity import cc_visit
-from radon.metrics import mi_visit
-from tqdm import tqdm
 
 from .models import (
     AnalysisResult, ModuleInfo, FunctionInfo, ClassInfo, CodeLocation,
     Issue, IssueType, IssueSeverity, CriticalSection, AnalysisMetrics
 )
-from .important_sections import ImportantSectionIdentifier
-from .improvement_detector import ImprovementDetector
 from .plugins import PluginManager
-from .code_library import CodeLibrary, PatternMatcher, create_default_library
+from .ast_cache import AstCache
 from .base_analyzer import LanguageAnalyzer
-from .js_analyzer import JavaScriptAnalyzer
 from .language_detection import LanguageDetector
 
+# Heavier modules only needed for some runs (code library, progress bars,
+# process pools, radon, JS analysis, reports) are imported where they are used
+# so importing the analyzer stays cheap.
+if TYPE_CHECKING:
+    from .code_library import CodeLibrary, PatternMatcher
+
+
+# Statements that add a decision point to a function's cyclomatic complexity.
+# Matched with type() rather than isinstance() since these classes have no subclasses.
+_BRANCH_NODES = frozenset({ast.If, ast.For, ast.While, ast.ExceptHandler})
+_FUNCTION_NODES = frozenset({ast.FunctionDef, ast.AsyncFunctionDef})
+# Nodes opening a new scope; a yield inside one doesn't make the outer function a generator
+_SCOPE_NODES = _FUNCTION_NODES | {ast.Lambda}
+
+# Special methods and common entry points never reported as unused
+_ENTRY_POINT_NAMES = frozenset({'__init__', '__main__', 'main', '__str__', '__repr__'})
+
+# compile() flags for parsing: an AST only, constant-folded on Python 3.13+
+_PARSE_FLAGS = ast.PyCF_ONLY_AST | getattr(ast, 'PyCF_OPTIMIZED_AST', 0)
+
+# Version-control and tool cache directories that never hold project sources.
+# They are pruned during discovery regardless of the configured ignore patterns.
+_EXCLUDED_DIRS = frozenset({
+    '.git', '.hg', '.svn', '__pycache__', '.mypy_cache', '.pytest_cache',
+    '.ruff_cache', '.tox', '.nox',
+})
+
+
+def _compile_ignore_patterns(patterns: List[str]) -> Optional["re.Pattern[str]"]:
+    """Combine ignore patterns into one regex matching whole path components.
+    
+    Leading "*/" and trailing "/*" only say the pattern may appear anywhere in
+    the path, so they are dropped. In what remains "*" and "?" match within a
+    single component, e.g. "*.egg-info/*" matches "pkg.egg-info". Patterns are
+    written with "/", but match paths using any of the platform's separators.
+    """
+    seps = re.escape(os.sep) + (re.escape(os.altsep) if os.altsep else '')
+    sep, not_sep = f"[{seps}]", f"[^{seps}]"
+    alternatives = []
+    for pattern in patterns:
+        core = re.sub(r'(/\*+)+$', '', re.sub(r'^(\*+/)+', '', pattern))
+        if core:
+            alternatives.append(''.join(
+                f"{not_sep}*" if ch == '*' else not_sep if ch == '?'
+                else sep if ch == '/' else re.escape(ch)
+                for ch in core
+            ))
+    if not alternatives:
+        return None
+    return re.compile(f"(?:^|{sep})(?:{'|'.join(alternatives)})(?:{sep}|$)")
+
+
+def _yields_directly(node: ast.AST) -> bool:
+    """Check whether a function yields, not counting nested functions and lambdas."""
+    for child in ast.iter_child_nodes(node):
+        child_type = type(child)
+        if child_type is ast.Yield:
+            return True
+        if child_type not in _SCOPE_NODES and _yields_directly(child):
+            return True
+    return False
+
+
+def _read_source(file_path) -> bytes:
+    """Read a whole file with raw os.read calls, bypassing Python's io layers."""
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        chunks = []
+        while True:
+            chunk = os.read(fd, max(size, 65536))
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return b"".join(chunks)
+    finally:
+        os.close(fd)
+
+
+def _count_lines(data: bytes) -> int:
+    """Count lines in raw source without splitting it into a list."""
+    if not data:
+        return 0
+    return data.count(b"\n") + (not data.endswith(b"\n"))
+
+
+# Number of Python files read ahead of serial analysis. os.read releases the
+# GIL, so reader threads overlap disk I/O with parsing in the main thread.
+# Set CODE_ANALYZER_NO_PREFETCH to read each file inline instead.
+_PREFETCH_WINDOW = 32
+_PREFETCH_THREADS = 4
+
+
+# Walk top-level project directories concurrently during discovery. This pays
+# off when listing directories waits on I/O (network or cold filesystems); on a
+# warm local disk the Python-side walk dominates and threads only add overhead.
+_PARALLEL_DISCOVERY = bool(os.environ.get("CODE_ANALYZER_PARALLEL_DISCOVERY"))
+
+
+# Analyzer instances owned by pool worker processes, keyed by (project_path, languages)
+_worker_analyzers: Dict[Tuple[str, Tuple[str, ...]], "CodeAnalyzer"] = {}
+
+
+def _analyze_file_worker(file_path: Path, project_path: str, languages: Tuple[str, ...],
+                         data: Optional[bytes] = None) -> Tuple[Optional[ModuleInfo], Optional[str]]:
+    """Analyze a single file inside a worker process.
+    
+    Each worker builds its own CodeAnalyzer once and reuses it for every file
+    it receives, so only the file path, plus its contents when the parent
+    already read them, crosses the process boundary.
+    
+    Returns:
+        Tuple of (module info or None, error message or None)
+    """
+    key = (project_path, languages)
+    analyzer = _worker_analyzers.get(key)
+    if analyzer is None:
+        analyzer = _worker_analyzers[key] = CodeAnalyzer(project_path, languages=list(languages))
+    try:
+        return analyzer._analyze_any_file(file_path, data), None
+    except Exception as e:
+        return None, str(e)
+
 
 class CodeAnalyzer:
     """Main code analyzer that supports multiple programming languages."""
     
     def __init__(self, project_path: str, ignore_patterns: Optional[List[str]] = None,
                  plugin_dir: Optional[Path] = None, code_library_path: Optional[Path] = None,
-                 languages: Optional[List[str]] = None):
-        """Initialize analyzer with project path."""
-        self.project_path = Path(project_path).resolve()
+                 languages: Optional[List[str]] = None, cache_dir: Optional[Path] = None):
+        """Initialize analyzer with project path.
+        
+        Args:
+            cache_dir: Directory for cached per-file results. Caching is
+                disabled when not given.
+        """
         self.ignore_patterns = ignore_patterns or [
             "*/venv/*", "*/env/*", "*/.venv/*", "*/node_modules/*",
             "*/migrations/*", "*/build/*", "*/dist/*",
             "*/.git/*", "*/__pycache__/*", "*.egg-info/*"
         ]
-        self.modules: List[ModuleInfo] = []
-        self.issues: List[Issue] = []
-        self.critical_sections: List[CriticalSection] = []
-        self.call_graph: Dict[str, Set[str]] = {}
+        self._ignore_re = _compile_ignore_patterns(self.ignore_patterns)
+        # Directory names pruned by a cheap set lookup during discovery:
+        # the always-excluded tool directories plus plain "*/name/*" patterns
+        self._excluded_dir_names = _EXCLUDED_DIRS | {
+            pattern[2:-2] for pattern in self.ignore_patterns
+            if pattern.startswith('*/') and pattern.endswith('/*')
+            and not any(ch in pattern[2:-2] for ch in '*?[/')
+        }
+        self.set_project(project_path)
         
         # Language detection and analyzers
         self.language_detector = LanguageDetector()
@@ -48,6 +179,9 @@ class CodeAnalyzer:
         # Register language analyzers
         self._register_language_analyzers()
         
+        # Per-file result cache
+        self.cache: Optional[AstCache] = AstCache(cache_dir) if cache_dir else None
+        
         # Plugin system
         self.plugin_manager = PluginManager()
         if plugin_dir:
@@ -55,8 +189,10 @@ class CodeAnalyzer:
             self.plugin_manager.load_plugins_from_directory(plugin_dir)
         
         # Code library
-        self.code_library: Optional[CodeLibrary] = None
-        self.pattern_matcher: Optional[PatternMatcher] = None
+        self.code_library: Optional["CodeLibrary"] = None
+        self.pattern_matcher: Optional["PatternMatcher"] = None
+        if code_library_path is not None:
+            from .code_library import CodeLibrary, PatternMatcher, create_default_library
         if code_library_path:
             print(f"📚 Loading code library from {code_library_path}")
             self.code_library = CodeLibrary(code_library_path)
@@ -66,10 +202,43 @@ class CodeAnalyzer:
             self.code_library = create_default_library()
             self.pattern_matcher = PatternMatcher(self.code_library)
     
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def shared(cls, cache_dir: Optional[Path] = None) -> "CodeAnalyzer":
+        """Return a process-wide analyzer with default settings.
+        
+        Language analyzers and plugins are set up once; bind the analyzer to
+        a project with set_project() before each analysis.
+        
+        Args:
+            cache_dir: Directory for cached per-file results, or None
+            
+        Returns:
+            The cached CodeAnalyzer for these settings
+        """
+        return cls(os.curdir, cache_dir=cache_dir)
+    
+    def set_project(self, project_path: str) -> "CodeAnalyzer":
+        """Point the analyzer at a project and clear results of earlier runs.
+        
+        Args:
+            project_path: Root directory of the project to analyze
+            
+        Returns:
+            The analyzer itself, so calls can be chained with analyze()
+        """
+        self.project_path = Path(project_path).resolve()
+        self.modules: List[ModuleInfo] = []
+        self.issues: List[Issue] = []
+        self.critical_sections: List[CriticalSection] = []
+        self.call_graph: Dict[str, Set[str]] = {}
+        return self
+    
     def _register_language_analyzers(self):
         """Register available language analyzers."""
         # JavaScript/TypeScript analyzer
         if any(lang in self.enabled_languages for lang in ['javascript', 'typescript']):
+            from .js_analyzer import JavaScriptAnalyzer
             js_analyzer = JavaScriptAnalyzer()
             for ext in js_analyzer.get_supported_extensions():
                 self.language_analyzers[ext] = js_analyzer
@@ -82,12 +251,14 @@ class CodeAnalyzer:
         ext = file_path.suffix
         return self.language_analyzers.get(ext)
         
-    def analyze(self, depth: str = "deep") -> AnalysisResult:
+    def analyze(self, depth: str = "deep", workers: Optional[int] = 1) -> AnalysisResult:
         """
         Analyze the entire project.
         
         Args:
             depth: Analysis depth - 'shallow', 'medium', or 'deep'
+            workers: Number of processes used to analyze files. 1 analyzes
+                files in this process, None uses one process per CPU.
             
         Returns:
             AnalysisResult with complete analysis data
@@ -104,13 +275,7 @@ class CodeAnalyzer:
         self.plugin_manager.run_pre_analysis_hooks([])
         
         # Analyze each file with progress bar
-        for file_path in tqdm(source_files, desc="📄 Analyzing files", unit="file"):
-            try:
-                module_info = self._analyze_any_file(file_path)
-                if module_info:
-                    self.modules.append(module_info)
-            except Exception as e:
-                tqdm.write(f"   ⚠️  Error analyzing {file_path}: {e}")
+        self.modules.extend(self._analyze_files(source_files, workers))
         
         # Build call graph
         self._build_call_graph()
@@ -120,13 +285,7 @@ class CodeAnalyzer:
         
         # Detect issues based on depth
         if depth in ["medium", "deep"]:
-            self._detect_complexity_issues()
-            self._detect_unused_code()
-            self._detect_code_smells()
-        
-        if depth == "deep":
-            self._detect_security_issues()
-            self._detect_conceptual_issues()
+            self._detect_issues(deep=depth == "deep")
         
         # Calculate metrics
         metrics = self._calculate_metrics()
@@ -137,6 +296,9 @@ class CodeAnalyzer:
         # Build dependency graph
         dependency_graph = self._build_dependency_graph()
         
+        from .important_sections import ImportantSectionIdentifier
+        from .improvement_detector import ImprovementDetector
+        
         # Identify important sections
         important_identifier = ImportantSectionIdentifier()
         important_sections = important_identifier.identify_important_sections(self.modules)
@@ -154,6 +316,7 @@ class CodeAnalyzer:
         # Run pattern matching against code library
         library_matches = []
         if self.pattern_matcher:
+            from tqdm import tqdm
             for module in tqdm(self.modules, desc="📚 Pattern matching", unit="module"):
                 matches = self.pattern_matcher.find_matches(module)
                 library_matches.extend(matches)
@@ -192,46 +355,231 @@ class CodeAnalyzer:
             improvements=improvements
         )
     
-    def _find_source_files(self) -> List[Path]:
-        """Find all source files for enabled languages in the project."""
-        source_files = []
+    def _analyze_files(self, source_files: List[Path], workers: Optional[int] = 1) -> List[ModuleInfo]:
+        """Analyze source files, skipping cached ones and fanning out when workers > 1."""
+        results: Dict[Path, ModuleInfo] = {}
+        cache_keys: Dict[Path, Tuple[str, os.stat_result]] = {}
+        # Python sources read for hashing, handed on so misses are not read twice
+        sources: Dict[Path, bytes] = {}
+        pending = source_files
         
-        # Build list of extensions to search for
-        extensions = ['.py', '.pyi']  # Always include Python
-        for analyzer in self.language_analyzers.values():
-            extensions.extend(analyzer.get_supported_extensions())
-        extensions = list(set(extensions))  # Remove duplicates
+        # Results name modules relative to the project, so entries are per root
+        root = str(self.project_path)
+        
+        if self.cache:
+            pending = []
+            for file_path in source_files:
+                path = str(file_path)
+                try:
+                    stat = os.stat(file_path)
+                    module_info = self.cache.get_unchanged(root, path, stat.st_mtime_ns, stat.st_size)
+                    if module_info is None:
+                        data = _read_source(file_path)
+                        key = self.cache.make_key(data)
+                        module_info = self.cache.get(root, path, key)
+                        if module_info is not None:
+                            self.cache.touch(root, path, key, stat.st_mtime_ns, stat.st_size)
+                        elif file_path.suffix in ('.py', '.pyi'):
+                            sources[file_path] = data
+                except OSError:
+                    pending.append(file_path)
+                    continue
+                if module_info is not None:
+                    results[file_path] = module_info
+                else:
+                    cache_keys[file_path] = (key, stat)
+                    pending.append(file_path)
+            if results:
+                print(f"   Reusing {len(results)} cached file results")
+        
+        for file_path, module_info in self._run_file_analysis(pending, workers, sources):
+            results[file_path] = module_info
+            if file_path in cache_keys:
+                key, stat = cache_keys[file_path]
+                self.cache.put(root, str(file_path), key, stat.st_mtime_ns, stat.st_size, module_info)
+        
+        if self.cache:
+            # Forget files that were deleted or are no longer analyzed
+            self.cache.prune(root, (str(file_path) for file_path in source_files))
+            self.cache.commit()
+        
+        return [results[file_path] for file_path in source_files if file_path in results]
+    
+    def _run_file_analysis(self, source_files: List[Path], workers: Optional[int] = 1,
+                           sources: Optional[Dict[Path, bytes]] = None):
+        """Yield (file_path, module_info) for each successfully analyzed file.
+        
+        Args:
+            source_files: Files to analyze
+            workers: Worker processes to use; 1 runs in-process, None uses one per CPU
+            sources: Contents already read for some files, consumed as they are analyzed
+        """
+        from tqdm import tqdm
+        
+        workers = workers or os.cpu_count() or 1
+        if sources is None:
+            sources = {}
+        
+        if workers <= 1 or len(source_files) <= 1:
+            prefetched = self._prefetch_sources(source_files, sources)
+            for file_path, data in tqdm(prefetched, total=len(source_files),
+                                        desc="📄 Analyzing files", unit="file"):
+                try:
+                    module_info = self._analyze_any_file(file_path, data)
+                    if module_info:
+                        yield file_path, module_info
+                except Exception as e:
+                    tqdm.write(f"   ⚠️  Error analyzing {file_path}: {e}")
+            return
+        
+        from concurrent.futures import ProcessPoolExecutor
+        
+        chunksize = max(1, len(source_files) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(
+                _analyze_file_worker,
+                source_files,
+                repeat(str(self.project_path)),
+                repeat(tuple(self.enabled_languages)),
+                [sources.pop(file_path, None) for file_path in source_files],
+                chunksize=chunksize,
+            )
+            for file_path, (module_info, error) in tqdm(
+                zip(source_files, results), total=len(source_files),
+                desc="📄 Analyzing files", unit="file"
+            ):
+                if error:
+                    tqdm.write(f"   ⚠️  Error analyzing {file_path}: {error}")
+                elif module_info:
+                    yield file_path, module_info
+    
+    @staticmethod
+    def _prefetch_sources(source_files: List[Path], sources: Optional[Dict[Path, bytes]] = None):
+        """Yield (file_path, contents) with Python file reads running ahead in threads.
+        
+        Contents found in sources are used as they are, and removed from it.
+        Contents are None for other languages, whose analyzers read their own
+        files, and for files that could not be read; the analyzer then reads
+        the file itself and reports any error.
+        """
+        if sources is None:
+            sources = {}
+        if len(source_files) <= 1 or os.environ.get("CODE_ANALYZER_NO_PREFETCH"):
+            for file_path in source_files:
+                yield file_path, sources.pop(file_path, None)
+            return
+        
+        from concurrent.futures import ThreadPoolExecutor
         
-        for root, dirs, files in os.walk(self.project_path):
-            # Filter out ignored directories
-            dirs[:] = [d for d in dirs if not self._should_ignore(Path(root) / d)]
+        with ThreadPoolExecutor(max_workers=_PREFETCH_THREADS) as executor:
+            def submit(file_path):
+                if file_path.suffix in ('.py', '.pyi') and file_path not in sources:
+                    return file_path, executor.submit(_read_source, file_path)
+                return file_path, None
             
-            for file in files:
-                file_path = Path(root) / file
-                if file_path.suffix in extensions and not self._should_ignore(file_path):
-                    source_files.append(file_path)
+            files = iter(source_files)
+            pending = deque(submit(file_path) for file_path in islice(files, _PREFETCH_WINDOW))
+            while pending:
+                file_path, future = pending.popleft()
+                next_file = next(files, None)
+                if next_file is not None:
+                    pending.append(submit(next_file))
+                try:
+                    data = future.result() if future else sources.pop(file_path, None)
+                except OSError:
+                    data = None
+                yield file_path, data
+    
+    def _find_source_files(self) -> List[Path]:
+        """Find all source files for enabled languages in the project."""
+        # Build set of extensions to search for
+        extensions = {'.py', '.pyi'}  # Always include Python
+        for analyzer in self.language_analyzers.values():
+            extensions.update(analyzer.get_supported_extensions())
         
-        return source_files
+        return [Path(p) for p in self._walk(str(self.project_path), extensions, _PARALLEL_DISCOVERY)]
     
     def _find_python_files(self) -> List[Path]:
         """Find all Python files in the project (legacy method)."""
-        python_files = []
-        for root, dirs, files in os.walk(self.project_path):
-            # Filter out ignored directories
-            dirs[:] = [d for d in dirs if not self._should_ignore(Path(root) / d)]
+        return [Path(p) for p in self._walk(str(self.project_path), {'.py'}, _PARALLEL_DISCOVERY)]
+    
+    def _walk(self, root: str, extensions: Set[str], parallel: bool = False) -> List[str]:
+        """Return paths of non-ignored files under root with a matching extension.
+        
+        Uses os.scandir so directory entries carry their file type and no
+        extra stat() or Path object is needed per entry. Paths stay strings
+        until the caller wraps the survivors. The tree is walked depth-first
+        with an explicit stack of directory listings instead of recursion,
+        visiting entries in the same order as a recursive walk.
+        
+        With parallel=True and more than one top-level directory, each of
+        those subtrees is walked in a thread pool. Listing directories is
+        I/O bound and os.scandir releases the GIL, so on slow or network
+        filesystems the waits overlap. Results keep the sequential order.
+        """
+        entries = self._list_dir(root)
+        if parallel and sum(1 for entry in entries if entry.is_dir()) > 1:
+            from concurrent.futures import ThreadPoolExecutor
             
-            for file in files:
-                if file.endswith('.py'):
-                    file_path = Path(root) / file
-                    if not self._should_ignore(file_path):
-                        python_files.append(file_path)
-        return python_files
-    
-    def _analyze_any_file(self, file_path: Path) -> Optional[ModuleInfo]:
+            with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+                segments = self._walk_entries(entries, extensions, executor)
+                return [path for segment in segments
+                        for path in (segment if isinstance(segment, list) else segment.result())]
+        return self._walk_entries(entries, extensions)[0]
+    
+    def _walk_entries(self, entries: List[os.DirEntry], extensions: Set[str], executor=None) -> list:
+        """Walk the given directory entries and everything below them.
+        
+        Returns a list of segments in walk order: lists of paths, plus one
+        future per top-level directory handed off to the executor if given.
+        Without an executor the result is a single list.
+        """
+        excluded = self._excluded_dir_names
+        should_ignore = self._should_ignore_str
+        extensions = frozenset(extensions)
+        found = []
+        segments = [found]
+        stack = [iter(entries)]
+        while stack:
+            entry = next(stack[-1], None)
+            if entry is None:
+                stack.pop()
+            elif entry.is_dir():
+                # Skip excluded subtrees without opening them; like os.walk,
+                # don't descend into symlinked directories
+                if entry.name in excluded or entry.is_symlink():
+                    continue
+                if should_ignore(entry.path):
+                    continue
+                if executor is not None and len(stack) == 1:
+                    segments.append(executor.submit(self._walk, entry.path, extensions))
+                    found = []
+                    segments.append(found)
+                else:
+                    stack.append(iter(self._list_dir(entry.path)))
+            else:
+                # Extension check on the bare name first; a leading dot alone
+                # (".pyrc") is not an extension, matching os.path.splitext
+                name = entry.name
+                dot = name.rfind('.')
+                if dot > 0 and name[dot:] in extensions and not should_ignore(entry.path):
+                    found.append(entry.path)
+        return segments
+    
+    @staticmethod
+    def _list_dir(path: str) -> List[os.DirEntry]:
+        """List a directory, treating unreadable directories as empty."""
+        try:
+            with os.scandir(path) as it:
+                return list(it)
+        except OSError:
+            return []
+    
+    def _analyze_any_file(self, file_path: Path, data: Optional[bytes] = None) -> Optional[ModuleInfo]:
         """Route file to appropriate analyzer based on extension."""
         # Check if it's a Python file (use legacy analyzer)
         if file_path.suffix in ['.py', '.pyi']:
-            return self._analyze_file(file_path)
+            return self._analyze_file(file_path, data)
         
         # Use language-specific analyzer
         analyzer = self._get_analyzer_for_file(file_path)
@@ -242,76 +590,87 @@ class CodeAnalyzer:
     
     def _should_ignore(self, path: Path) -> bool:
         """Check if path should be ignored."""
-        path_str = str(path)
+        return self._should_ignore_str(str(path))
+    
+    def _should_ignore_str(self, path_str: str) -> bool:
+        """Check if a path given as a string should be ignored."""
+        return self._ignore_re is not None and self._ignore_re.search(path_str) is not None
+    
+    def _analyze_file(self, file_path: Path, data: Optional[bytes] = None) -> Optional[ModuleInfo]:
+        """Analyze a single Python file.
         
-        # Check if any part of the path matches ignore patterns
-        for pattern in self.ignore_patterns:
-            # Remove leading */ for proper matching
-            clean_pattern = pattern.lstrip('*/')
+        Args:
+            file_path: File to analyze
+            data: Raw file contents if already read, otherwise the file is read here
+        """
+        try:
+            if data is None:
+                data = _read_source(file_path)
             
-            # Check if pattern exists anywhere in the path
-            if f'/{clean_pattern}/' in path_str or path_str.endswith(f'/{clean_pattern}'):
-                return True
+            # Resolve the file once; every location in it shares the relative path
+            rel_path = file_path.resolve().relative_to(self.project_path)
+            rel_path_str = str(rel_path)
+            module_name = self._module_name(rel_path)
             
-            # Also check directory names directly
-            parts = Path(path_str).parts
-            if clean_pattern.rstrip('/*') in parts:
-                return True
-        
-        return False
-    
-    def _analyze_file(self, file_path: Path) -> Optional[ModuleInfo]:
-        """Analyze a single Python file."""
-        try:
-            # Try UTF-8 first, then fall back to latin-1
+            # Blank files (typically empty __init__.py) have nothing to parse
+            if not data or data.isspace():
+                return ModuleInfo(
+                    name=module_name,
+                    file_path=rel_path_str,
+                    docstring=None,
+                    lines_of_code=_count_lines(data)
+                )
+            
+            # Parse the raw bytes: the C tokenizer decodes them itself, honouring
+            # BOMs and PEP 263 coding declarations, so no Python-level decode is
+            # needed. Undeclared non-UTF-8 files or bogus declarations fail to
+            # decode there, so only those are decoded (UTF-8, then latin-1,
+            # which accepts any byte) and parsed from text instead.
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-            except UnicodeDecodeError:
-                # Try latin-1 as fallback
+                tree = compile(data, str(file_path), 'exec', _PARSE_FLAGS, dont_inherit=True)
+            except SyntaxError:
                 try:
-                    with open(file_path, 'r', encoding='latin-1') as f:
-                        content = f.read()
+                    content = data.decode('utf-8')
                 except UnicodeDecodeError:
-                    # Skip files with encoding issues
-                    return None
-            
-            tree = ast.parse(content, filename=str(file_path))
+                    content = data.decode('latin-1')
+                tree = compile(content, str(file_path), 'exec', _PARSE_FLAGS, dont_inherit=True)
             
             # Extract module information
-            module_name = self._get_module_name(file_path)
             docstring = ast.get_docstring(tree)
             
             module_info = ModuleInfo(
                 name=module_name,
-                file_path=str(file_path.resolve().relative_to(self.project_path.resolve())),
+                file_path=rel_path_str,
                 docstring=docstring,
-                lines_of_code=len(content.splitlines())
+                lines_of_code=_count_lines(data)
             )
             
-            # Analyze imports
+            # Collect imports and classes (including nested ones) in one walk.
+            # Names that repeat across files (imports, calls, decorators) are
+            # interned so each distinct name is stored once.
+            imports = module_info.imports
             for node in ast.walk(tree):
-                if isinstance(node, ast.Import):
+                node_type = type(node)
+                if node_type is ast.Import:
                     for alias in node.names:
-                        module_info.imports.append(alias.name)
-                elif isinstance(node, ast.ImportFrom):
+                        imports.append(intern(alias.name))
+                elif node_type is ast.ImportFrom:
                     if node.module:
-                        module_info.imports.append(node.module)
-            
-            # Analyze classes and functions
-            for node in ast.walk(tree):
-                if isinstance(node, ast.ClassDef):
-                    class_info = self._analyze_class(node, file_path)
+                        imports.append(intern(node.module))
+                elif node_type is ast.ClassDef:
+                    class_info = self._analyze_class(node, rel_path_str)
                     module_info.classes.append(class_info)
-                elif isinstance(node, ast.FunctionDef) or isinstance(node, ast.AsyncFunctionDef):
-                    # Only top-level functions
-                    if self._is_top_level(node, tree):
-                        func_info = self._analyze_function(node, file_path)
-                        module_info.functions.append(func_info)
             
-            # Calculate complexity
+            # Only top-level functions, which are exactly those in the module body
+            for node in tree.body:
+                if type(node) in _FUNCTION_NODES:
+                    func_info = self._analyze_function(node, rel_path_str)
+                    module_info.functions.append(func_info)
+            
+            # Calculate complexity on the tree we already parsed
             try:
-                complexity_results = cc_visit(content)
+                from radon.complexity import cc_visit_ast
+                complexity_results = cc_visit_ast(tree)
                 module_info.complexity = sum(r.complexity for r in complexity_results)
             except:
                 pass
@@ -327,26 +686,26 @@ class CodeAnalyzer:
     
     def _get_module_name(self, file_path: Path) -> str:
         """Get module name from file path."""
-        # Resolve both paths to handle symlinks
-        resolved_file = file_path.resolve()
-        resolved_project = self.project_path.resolve()
-        rel_path = resolved_file.relative_to(resolved_project)
+        # Resolve the file to handle symlinks; the project path already is
+        return self._module_name(file_path.resolve().relative_to(self.project_path))
+    
+    @staticmethod
+    def _module_name(rel_path: Path) -> str:
+        """Get module name from a path relative to the project root."""
         parts = list(rel_path.parts[:-1]) + [rel_path.stem]
         if parts[-1] == '__init__':
             parts = parts[:-1]
         return '.'.join(parts) if parts else '__main__'
     
-    def _is_top_level(self, node: ast.AST, tree: ast.Module) -> bool:
-        """Check if node is at module level."""
-        for item in tree.body:
-            if item == node:
-                return True
-        return False
-    
-    def _analyze_class(self, node: ast.ClassDef, file_path: Path) -> ClassInfo:
-        """Analyze a class definition."""
+    def _analyze_class(self, node: ast.ClassDef, file_path: str) -> ClassInfo:
+        """Analyze a class definition.
+        
+        Args:
+            node: Class definition node
+            file_path: Path of the file relative to the project root
+        """
         location = CodeLocation(
-            file_path=str(file_path.resolve().relative_to(self.project_path.resolve())),
+            file_path=file_path,
             line_start=node.lineno,
             line_end=node.end_lineno or node.lineno,
             class_name=node.name
@@ -377,11 +736,17 @@ class CodeAnalyzer:
         
         return class_info
     
-    def _analyze_function(self, node: ast.FunctionDef, file_path: Path, 
+    def _analyze_function(self, node: ast.FunctionDef, file_path: str,
                          class_name: Optional[str] = None) -> FunctionInfo:
-        """Analyze a function definition."""
+        """Analyze a function definition.
+        
+        Args:
+            node: Function definition node
+            file_path: Path of the file relative to the project root
+            class_name: Name of the enclosing class for methods
+        """
         location = CodeLocation(
-            file_path=str(file_path.resolve().relative_to(self.project_path.resolve())),
+            file_path=file_path,
             line_start=node.lineno,
             line_end=node.end_lineno or node.lineno,
             function_name=node.name,
@@ -399,29 +764,39 @@ class CodeAnalyzer:
         # Get docstring
         docstring = ast.get_docstring(node)
         
-        # Calculate complexity
-        complexity = 1  # Base complexity
-        for _ in ast.walk(node):
-            if isinstance(_, (ast.If, ast.For, ast.While, ast.ExceptHandler)):
-                complexity += 1
-        
-        # Find function calls
+        # Single walk over the body collecting complexity (base complexity
+        # of 1 plus one per branch), called names and whether it yields.
+        # Accumulate in locals and dispatch on the exact node type.
+        complexity = 1
         calls = []
+        has_yield = False
+        has_nested_scope = False
+        get_name = self._get_name
         for child in ast.walk(node):
-            if isinstance(child, ast.Call):
-                call_name = self._get_name(child.func)
+            child_type = type(child)
+            if child_type in _BRANCH_NODES:
+                complexity += 1
+            elif child_type is ast.Call:
+                call_name = get_name(child.func)
                 if call_name:
-                    calls.append(call_name)
+                    calls.append(intern(call_name))
+            elif child_type is ast.Yield:
+                has_yield = True
+            elif child_type in _SCOPE_NODES and child is not node:
+                has_nested_scope = True
+        
+        # A yield only makes this a generator if it isn't inside a nested
+        # function or lambda; re-check the rare ambiguous case with a scoped walk
+        is_generator = has_yield and (not has_nested_scope or _yields_directly(node))
         
         # Extract decorators
         decorators = []
         for decorator in node.decorator_list:
             decorator_name = self._get_name(decorator)
             if decorator_name:
-                decorators.append(decorator_name)
+                decorators.append(intern(decorator_name))
         
         is_async = isinstance(node, ast.AsyncFunctionDef)
-        is_generator = any(isinstance(n, ast.Yield) for n in ast.walk(node))
         
         return FunctionInfo(
             name=node.name,
@@ -437,15 +812,28 @@ class CodeAnalyzer:
         )
     
     def _get_name(self, node: ast.AST) -> str:
-        """Extract name from AST node."""
-        if isinstance(node, ast.Name):
-            return node.id
-        elif isinstance(node, ast.Attribute):
-            value = self._get_name(node.value)
-            return f"{value}.{node.attr}" if value else node.attr
-        elif isinstance(node, ast.Call):
-            return self._get_name(node.func)
-        return ""
+        """Extract name from AST node.
+        
+        Follows attribute and call chains iteratively, so "a.b().c" gives
+        "a.b.c". Chains rooted in anything but a name keep the attribute
+        part only.
+        """
+        parts = []
+        while True:
+            node_type = type(node)
+            if node_type is ast.Attribute:
+                parts.append(node.attr)
+                node = node.value
+            elif node_type is ast.Call:
+                node = node.func
+            else:
+                if node_type is ast.Name:
+                    parts.append(node.id)
+                break
+        if len(parts) == 1:
+            return parts[0]
+        parts.reverse()
+        return '.'.join(parts)
     
     def _build_call_graph(self):
         """Build call graph from analyzed functions."""
@@ -453,30 +841,35 @@ class CodeAnalyzer:
         func_map = {}
         for module in self.modules:
             for func in module.functions:
-                full_name = f"{module.name}.{func.name}"
+                full_name = intern(f"{module.name}.{func.name}")
                 func_map[func.name] = full_name
                 self.call_graph[full_name] = set(func.calls)
             
             for cls in module.classes:
                 for method in cls.methods:
-                    full_name = f"{module.name}.{cls.name}.{method.name}"
+                    full_name = intern(f"{module.name}.{cls.name}.{method.name}")
                     func_map[method.name] = full_name
                     self.call_graph[full_name] = set(method.calls)
         
+        # Index every function and method under each qualified name it
+        # answers to, so resolving a call is a dict lookup
+        targets: Dict[str, List[FunctionInfo]] = {}
+        for module in self.modules:
+            class_prefixes = [f"{module.name}.{cls.name}." for cls in module.classes]
+            for f in module.functions + [mth for cls in module.classes for mth in cls.methods]:
+                names = {f"{module.name}.{f.name}"}
+                names.update(prefix + f.name for prefix in class_prefixes)
+                for name in names:
+                    targets.setdefault(name, []).append(f)
+        
         # Update called_by relationships
         for module in self.modules:
             for func in module.functions:
-                full_name = f"{module.name}.{func.name}"
+                full_name = intern(f"{module.name}.{func.name}")
                 for call in func.calls:
                     if call in func_map:
-                        called_name = func_map[call]
-                        # Find the called function and update its called_by list
-                        for m in self.modules:
-                            for f in m.functions + [mth for cls in m.classes for mth in cls.methods]:
-                                if f"{m.name}.{f.name}" == called_name or \
-                                   any(f"{m.name}.{cls.name}.{f.name}" == called_name 
-                                       for cls in m.classes):
-                                    f.called_by.append(full_name)
+                        for f in targets.get(func_map[call], ()):
+                            f.called_by.append(full_name)
     
     def _identify_critical_sections(self):
         """Identify critical sections of code."""
@@ -513,30 +906,133 @@ class CodeAnalyzer:
                     impact_areas=["startup", "initialization"]
                 ))
     
-    def _detect_complexity_issues(self):
-        """Detect complexity-related issues."""
+    def _detect_issues(self, deep: bool = False):
+        """Run the issue detectors in a single pass over modules and functions.
+        
+        Issues are still reported grouped by detector, in the order the
+        detectors used to run: complexity, unused code, code smells and, for
+        deep analysis, security and conceptual issues.
+        
+        Args:
+            deep: Also run the security and conceptual detectors
+        """
+        complexity_issues: List[Issue] = []
+        unused_issues: List[Issue] = []
+        smell_issues: List[Issue] = []
+        security_issues: List[Issue] = []
+        conceptual_issues: List[Issue] = []
+        
+        # Top-level functions with at least one caller, by qualified name
+        called = {
+            f"{module.name}.{func.name}"
+            for module in self.modules for func in module.functions if func.called_by
+        }
+        
         for module in self.modules:
-            for func in module.functions + [m for cls in module.classes for m in cls.methods]:
-                if func.complexity > 15:
-                    self.issues.append(Issue(
-                        issue_type=IssueType.COMPLEXITY,
-                        severity=IssueSeverity.HIGH,
-                        title=f"High complexity in {func.name}",
-                        description=f"Function has cyclomatic complexity of {func.complexity}",
+            docstring_issues = []
+            for func in module.functions:
+                self._check_complexity(func, complexity_issues)
+                self._check_parameters(func, smell_issues)
+                if not func.docstring and not func.name.startswith('_'):
+                    docstring_issues.append(Issue(
+                        issue_type=IssueType.DOCUMENTATION,
+                        severity=IssueSeverity.LOW,
+                        title=f"Missing docstring: {func.name}",
+                        description="Public function lacks documentation",
                         location=func.location,
-                        recommendation="Consider breaking this function into smaller, more focused functions",
-                        metadata={"complexity": func.complexity}
+                        recommendation="Add a docstring describing purpose, parameters, and return value"
                     ))
-                elif func.complexity > 10:
-                    self.issues.append(Issue(
-                        issue_type=IssueType.COMPLEXITY,
-                        severity=IssueSeverity.MEDIUM,
-                        title=f"Moderate complexity in {func.name}",
-                        description=f"Function has cyclomatic complexity of {func.complexity}",
+                func_name = f"{module.name}.{func.name}"
+                if func_name not in called and self._is_unused(func, module):
+                    unused_issues.append(Issue(
+                        issue_type=IssueType.UNUSED_CODE,
+                        severity=IssueSeverity.LOW,
+                        title=f"Potentially unused function: {func.name}",
+                        description="This function is not called anywhere in the codebase",
                         location=func.location,
-                        recommendation="Consider simplifying this function",
-                        metadata={"complexity": func.complexity}
+                        recommendation="Consider removing if truly unused, or document its external usage"
+                    ))
+            
+            for cls in module.classes:
+                for method in cls.methods:
+                    self._check_complexity(method, complexity_issues)
+                    self._check_parameters(method, smell_issues)
+                
+                # God classes (too many responsibilities)
+                if deep and len(cls.methods) > 20:
+                    conceptual_issues.append(Issue(
+                        issue_type=IssueType.CONCEPTUAL,
+                        severity=IssueSeverity.HIGH,
+                        title=f"God class: {cls.name}",
+                        description=f"Class has {len(cls.methods)} methods, indicating too many responsibilities",
+                        location=cls.location,
+                        recommendation="Consider splitting into smaller, more focused classes following SRP"
                     ))
+            
+            smell_issues.extend(docstring_issues)
+            
+            if deep:
+                self._check_imports(module, security_issues)
+        
+        self.issues.extend(complexity_issues)
+        self.issues.extend(unused_issues)
+        self.issues.extend(smell_issues)
+        self.issues.extend(security_issues)
+        self.issues.extend(conceptual_issues)
+    
+    def _check_complexity(self, func: FunctionInfo, issues: List[Issue]):
+        """Flag functions with high cyclomatic complexity."""
+        if func.complexity > 15:
+            issues.append(Issue(
+                issue_type=IssueType.COMPLEXITY,
+                severity=IssueSeverity.HIGH,
+                title=f"High complexity in {func.name}",
+                description=f"Function has cyclomatic complexity of {func.complexity}",
+                location=func.location,
+                recommendation="Consider breaking this function into smaller, more focused functions",
+                metadata={"complexity": func.complexity}
+            ))
+        elif func.complexity > 10:
+            issues.append(Issue(
+                issue_type=IssueType.COMPLEXITY,
+                severity=IssueSeverity.MEDIUM,
+                title=f"Moderate complexity in {func.name}",
+                description=f"Function has cyclomatic complexity of {func.complexity}",
+                location=func.location,
+                recommendation="Consider simplifying this function",
+                metadata={"complexity": func.complexity}
+            ))
+    
+    def _check_parameters(self, func: FunctionInfo, issues: List[Issue]):
+        """Flag functions with long parameter lists."""
+        if len(func.parameters) > 5:
+            issues.append(Issue(
+                issue_type=IssueType.CODE_SMELL,
+                severity=IssueSeverity.MEDIUM,
+                title=f"Long parameter list in {func.name}",
+                description=f"Function has {len(func.parameters)} parameters",
+                location=func.location,
+                recommendation="Consider using a configuration object or builder pattern"
+            ))
+    
+    def _check_imports(self, module: ModuleInfo, issues: List[Issue]):
+        """Flag imports of modules that are unsafe with untrusted input."""
+        # This is a simplified version - in production, use bandit or similar
+        dangerous_imports = ['pickle', 'marshal', 'shelve']
+        for imp in module.imports:
+            if any(danger in imp for danger in dangerous_imports):
+                issues.append(Issue(
+                    issue_type=IssueType.SECURITY,
+                    severity=IssueSeverity.MEDIUM,
+                    title=f"Potentially dangerous import: {imp}",
+                    description=f"Module imports {imp} which can be unsafe",
+                    location=CodeLocation(
+                        file_path=module.file_path,
+                        line_start=1,
+                        line_end=1
+                    ),
+                    recommendation="Ensure proper input validation when using this module"
+                ))
     
     def _has_framework_decorators(self, func: FunctionInfo) -> bool:
         """Check if function has decorators that indicate external usage."""
@@ -585,147 +1081,65 @@ class CodeAnalyzer:
         
         return False
     
-    def _detect_unused_code(self):
-        """Detect potentially unused code."""
-        # Find functions that are never called
-        all_functions = set()
-        called_functions = set()
+    def _is_unused(self, func: FunctionInfo, module: ModuleInfo) -> bool:
+        """Check whether an uncalled function should be reported as unused."""
+        # Skip special methods and common entry points
+        if func.name in _ENTRY_POINT_NAMES:
+            return False
         
-        for module in self.modules:
-            for func in module.functions:
-                func_name = f"{module.name}.{func.name}"
-                all_functions.add(func_name)
-                if func.called_by:
-                    called_functions.add(func_name)
-        
-        unused = all_functions - called_functions
-        for func_name in unused:
-            # Skip special methods and common entry points
-            if func_name.endswith(('__init__', '__main__', 'main', '__str__', '__repr__')):
-                continue
-            
-            # Find the function to get its location and decorators
-            for module in self.modules:
-                for func in module.functions:
-                    if f"{module.name}.{func.name}" == func_name:
-                        # Skip if it has framework decorators that make it used externally
-                        if self._has_framework_decorators(func):
-                            continue
-                        
-                        # Skip if it's in __init__.py (likely part of public API)
-                        if module.file_path.endswith('__init__.py'):
-                            continue
-                        
-                        # Skip if function name suggests it's a public API
-                        if self._is_public_api(func, module):
-                            continue
-                        
-                        self.issues.append(Issue(
-                            issue_type=IssueType.UNUSED_CODE,
-                            severity=IssueSeverity.LOW,
-                            title=f"Potentially unused function: {func.name}",
-                            description="This function is not called anywhere in the codebase",
-                            location=func.location,
-                            recommendation="Consider removing if truly unused, or document its external usage"
-                        ))
-    
-    def _detect_code_smells(self):
-        """Detect code smells and anti-patterns."""
-        for module in self.modules:
-            # Long parameter lists
-            for func in module.functions + [m for cls in module.classes for m in cls.methods]:
-                if len(func.parameters) > 5:
-                    self.issues.append(Issue(
-                        issue_type=IssueType.CODE_SMELL,
-                        severity=IssueSeverity.MEDIUM,
-                        title=f"Long parameter list in {func.name}",
-                        description=f"Function has {len(func.parameters)} parameters",
-                        location=func.location,
-                        recommendation="Consider using a configuration object or builder pattern"
-                    ))
-            
-            # Missing docstrings
-            for func in module.functions:
-                if not func.docstring and not func.name.startswith('_'):
-                    self.issues.append(Issue(
-                        issue_type=IssueType.DOCUMENTATION,
-                        severity=IssueSeverity.LOW,
-                        title=f"Missing docstring: {func.name}",
-                        description="Public function lacks documentation",
-                        location=func.location,
-                        recommendation="Add a docstring describing purpose, parameters, and return value"
-                    ))
-    
-    def _detect_security_issues(self):
-        """Detect potential security issues."""
-        # This is a simplified version - in production, use bandit or similar
-        for module in self.modules:
-            # Check for dangerous imports
-            dangerous_imports = ['pickle', 'marshal', 'shelve']
-            for imp in module.imports:
-                if any(danger in imp for danger in dangerous_imports):
-                    self.issues.append(Issue(
-                        issue_type=IssueType.SECURITY,
-                        severity=IssueSeverity.MEDIUM,
-                        title=f"Potentially dangerous import: {imp}",
-                        description=f"Module imports {imp} which can be unsafe",
-                        location=CodeLocation(
-                            file_path=module.file_path,
-                            line_start=1,
-                            line_end=1
-                        ),
-                        recommendation="Ensure proper input validation when using this module"
-                    ))
-    
-    def _detect_conceptual_issues(self):
-        """Detect conceptual and architectural issues."""
-        # God classes (too many responsibilities)
-        for module in self.modules:
-            for cls in module.classes:
-                if len(cls.methods) > 20:
-                    self.issues.append(Issue(
-                        issue_type=IssueType.CONCEPTUAL,
-                        severity=IssueSeverity.HIGH,
-                        title=f"God class: {cls.name}",
-                        description=f"Class has {len(cls.methods)} methods, indicating too many responsibilities",
-                        location=cls.location,
-                        recommendation="Consider splitting into smaller, more focused classes following SRP"
-                    ))
+        # Skip if it has framework decorators that make it used externally
+        if self._has_framework_decorators(func):
+            return False
+        
+        # Skip if it's in __init__.py (likely part of public API)
+        if module.file_path.endswith('__init__.py'):
+            return False
+        
+        # Skip if function name suggests it's a public API
+        return not self._is_public_api(func, module)
     
     def _calculate_metrics(self) -> AnalysisMetrics:
         """Calculate overall project metrics."""
         metrics = AnalysisMetrics()
         
         metrics.total_files = len(self.modules)
-        metrics.total_lines = sum(m.lines_of_code for m in self.modules)
-        metrics.total_classes = sum(len(m.classes) for m in self.modules)
-        metrics.total_functions = sum(
-            len(m.functions) + sum(len(c.methods) for c in m.classes)
-            for m in self.modules
-        )
         metrics.total_issues = len(self.issues)
         
-        # Group issues by severity
-        for issue in self.issues:
-            severity_key = issue.severity.value
-            metrics.issues_by_severity[severity_key] = \
-                metrics.issues_by_severity.get(severity_key, 0) + 1
+        # Accumulate totals and complexity stats in one pass over the modules
+        total_lines = total_classes = total_functions = 0
+        sum_complexity = max_complexity = 0
+        for module in self.modules:
+            total_lines += module.lines_of_code
+            total_classes += len(module.classes)
+            total_functions += len(module.functions)
+            for func in module.functions:
+                complexity = func.complexity
+                sum_complexity += complexity
+                if complexity > max_complexity:
+                    max_complexity = complexity
+            for cls in module.classes:
+                total_functions += len(cls.methods)
+                for method in cls.methods:
+                    complexity = method.complexity
+                    sum_complexity += complexity
+                    if complexity > max_complexity:
+                        max_complexity = complexity
         
-        # Group issues by type
+        metrics.total_lines = total_lines
+        metrics.total_classes = total_classes
+        metrics.total_functions = total_functions
+        if total_functions:
+            metrics.average_complexity = sum_complexity / total_functions
+            metrics.max_complexity = max_complexity
+        
+        # Group issues by severity and type
+        by_severity = metrics.issues_by_severity
+        by_type = metrics.issues_by_type
         for issue in self.issues:
+            severity_key = issue.severity.value
+            by_severity[severity_key] = by_severity.get(severity_key, 0) + 1
             type_key = issue.issue_type.value
-            metrics.issues_by_type[type_key] = \
-                metrics.issues_by_type.get(type_key, 0) + 1
-        
-        # Calculate complexity metrics
-        all_complexities = []
-        for module in self.modules:
-            for func in module.functions + [m for cls in module.classes for m in cls.methods]:
-                all_complexities.append(func.complexity)
-        
-        if all_complexities:
-            metrics.average_complexity = sum(all_complexities) / len(all_complexities)
-            metrics.max_complexity = max(all_complexities)
+            by_type[type_key] = by_type.get(type_key, 0) + 1
         
         return metrics
     
@@ -748,11 +1162,15 @@ class CodeAnalyzer:
         """Build module dependency graph."""
         dep_graph = {}
         
+        # Top-level packages of the project, matched against each import's
+        # first component
+        top_levels = {m.name.split('.', 1)[0] for m in self.modules}
+        
         for module in self.modules:
             # Filter to internal dependencies only
             internal_deps = [
                 imp for imp in module.imports
-                if any(imp.startswith(m.name.split('.')[0]) for m in self.modules)
+                if imp.split('.', 1)[0] in top_levels
             ]
             dep_graph[module.name] = internal_deps
         
@@ -2,14 +2,126 @@
 
 import ast
 import hashlib
+import io
+import os
+import tokenize
 from pathlib import Path
-from typing import Dict, Set, Optional
+from typing import Dict, Set, Optional, Tuple
 import re
 
 
+# A whole identifier-like word
+_WORD_RE = re.compile(r'\b[^\W\d]\w*')
+
+# Bytes of BLAKE2b digest in an anonymous name; grown by two bytes whenever a
+# generated name is already taken
+_NAME_DIGEST_SIZE = 6
+
+
+def _count_file_lines(path: Path) -> int:
+    """Count a file's lines by streaming it in binary chunks."""
+    lines = 0
+    last = b'\n'
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            lines += chunk.count(b'\n')
+            last = chunk[-1:]
+    # An unterminated last line still counts
+    return lines + (last != b'\n')
+
+
+def _collect_file_identifiers(file_path: Path) -> Tuple[Optional[Set[str]], Optional[str]]:
+    """Parse a file and collect its identifiers, possibly in a worker process.
+    
+    Returns:
+        Tuple of (identifiers or None, error message or None)
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            tree = ast.parse(f.read())
+        return CodeAnonymizer._collect_identifiers(tree), None
+    except Exception as e:
+        return None, str(e)
+
+
+class _IdentifierCollector(ast.NodeVisitor):
+    """Collect function, class, variable, attribute and parameter names.
+    
+    NodeVisitor dispatches on the node's class name, which is cheaper than
+    an isinstance() chain on every node of ast.walk().
+    """
+    
+    def __init__(self):
+        self.identifiers: Set[str] = set()
+    
+    def visit_FunctionDef(self, node):
+        self.identifiers.add(node.name)
+        self.generic_visit(node)
+    
+    visit_AsyncFunctionDef = visit_FunctionDef
+    visit_ClassDef = visit_FunctionDef
+    
+    def visit_Name(self, node):
+        # Only the expression context lies below a name
+        self.identifiers.add(node.id)
+    
+    def visit_Attribute(self, node):
+        self.identifiers.add(node.attr)
+        self.generic_visit(node)
+    
+    def visit_arg(self, node):
+        self.identifiers.add(node.arg)
+        self.generic_visit(node)
+    
+    def _skip(self, node):
+        # Literals (docstrings included) and expression contexts hold no
+        # names, so their fields are not scanned. F-strings are still entered:
+        # their replacement fields reference names.
+        pass
+    
+    visit_Constant = _skip
+    visit_Load = visit_Store = visit_Del = _skip
+
+
+# Anonymizer holding the finished mapping, set once per rewrite worker
+_worker_anonymizer: Optional["CodeAnonymizer"] = None
+
+
+def _init_rewrite_worker(anonymizer: "CodeAnonymizer"):
+    """Receive the anonymizer in a worker process before any files."""
+    global _worker_anonymizer
+    _worker_anonymizer = anonymizer
+
+
+def _rewrite_file_worker(file_path: Path, output_file: Path) -> Optional[str]:
+    """Write one anonymized file inside a worker process."""
+    return _worker_anonymizer._rewrite_file(file_path, output_file)
+
+
 class CodeAnonymizer:
     """Anonymizes code for external LLM analysis while preserving structure."""
     
+    # Common Python keywords/builtins that are never renamed
+    _PYTHON_BUILTINS = frozenset({
+        'True', 'False', 'None', 'self', 'cls',
+        'str', 'int', 'float', 'bool', 'list', 'dict', 'set', 'tuple',
+        'len', 'range', 'enumerate', 'zip', 'map', 'filter',
+        'print', 'open', 'type', 'isinstance', 'hasattr'
+    })
+    
+    _STDLIB_MODULES = frozenset({
+        'os', 'sys', 'json', 'yaml', 're', 'math', 'datetime',
+        'pathlib', 'collections', 'itertools', 'functools',
+        'typing', 'dataclasses', 'enum', 'abc', 'ast'
+    })
+    
+    # Directory names skipped wherever they appear in a path
+    _SKIP_PARTS = frozenset({
+        '__pycache__', '.git', 'venv', 'env', '.venv',
+        'build', 'dist', 'migrations'
+    })
+    _SKIP_SUFFIXES = ('.egg-info',)
+    
     def __init__(self, preserve_stdlib: bool = True):
         """
         Initialize anonymizer.
@@ -19,37 +131,66 @@ class CodeAnonymizer:
         """
         self.preserve_stdlib = preserve_stdlib
         self.name_mapping: Dict[str, str] = {}
-        self.counter = 0
-        self.stdlib_modules = {
-            'os', 'sys', 'json', 'yaml', 're', 'math', 'datetime',
-            'pathlib', 'collections', 'itertools', 'functools',
-            'typing', 'dataclasses', 'enum', 'abc', 'ast'
-        }
-    
-    def anonymize_project(self, source_path: Path, output_path: Path):
+        # Generated names back to the identifiers they were given to
+        self._anonymous_names: Dict[str, str] = {}
+        self.stdlib_modules = self._STDLIB_MODULES
+        # Names kept as-is, checked with a single set lookup
+        self._preserved_names = (
+            self._PYTHON_BUILTINS | self._STDLIB_MODULES if preserve_stdlib
+            else self._PYTHON_BUILTINS
+        )
+    
+    def anonymize_project(self, source_path: Path, output_path: Path, workers: Optional[int] = 1):
         """
         Anonymize entire project.
         
+        Identifiers are collected from every file first, then all files are
+        rewritten with the finished mapping, so names are consistent across
+        files whichever number of workers is used.
+        
         Args:
             source_path: Source project directory
             output_path: Output directory for anonymized code
+            workers: Number of processes used to parse and rewrite files.
+                1 works in this process, None uses one process per CPU.
         """
         output_path.mkdir(parents=True, exist_ok=True)
         
         # Write mapping file
         mapping_file = output_path / "ANONYMIZATION_MAP.txt"
         
-        # Find and anonymize all Python files
-        for py_file in source_path.rglob("*.py"):
-            if self._should_skip(py_file):
-                continue
-            
-            rel_path = py_file.relative_to(source_path)
-            output_file = output_path / rel_path
+        # Find all Python files
+        py_files = [f for f in source_path.rglob("*.py") if not self._should_skip(f)]
+        output_files = [output_path / f.relative_to(source_path) for f in py_files]
+        for output_file in output_files:
             output_file.parent.mkdir(parents=True, exist_ok=True)
+        
+        workers = workers or os.cpu_count() or 1
+        
+        if workers <= 1 or len(py_files) <= 1:
+            for py_file, (identifiers, error) in zip(py_files, map(_collect_file_identifiers, py_files)):
+                self._register_file_identifiers(py_file, identifiers, error)
+            errors = map(self._rewrite_file, py_files, output_files)
+            for py_file, error in zip(py_files, errors):
+                if error:
+                    print(f"Error anonymizing {py_file}: {error}")
+        else:
+            from concurrent.futures import ProcessPoolExecutor
             
-            anonymized = self.anonymize_file(py_file)
-            output_file.write_text(anonymized)
+            chunksize = max(1, len(py_files) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = executor.map(_collect_file_identifiers, py_files, chunksize=chunksize)
+                for py_file, (identifiers, error) in zip(py_files, results):
+                    self._register_file_identifiers(py_file, identifiers, error)
+            
+            # Ship the finished mapping to each worker once
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_rewrite_worker,
+                                     initargs=(self,)) as executor:
+                errors = executor.map(_rewrite_file_worker, py_files, output_files,
+                                      chunksize=chunksize)
+                for py_file, error in zip(py_files, errors):
+                    if error:
+                        print(f"Error anonymizing {py_file}: {error}")
         
         # Save mapping
         self._save_mapping(mapping_file)
@@ -58,6 +199,34 @@ class CodeAnonymizer:
         print(f"   Output: {output_path}")
         print(f"   Mapping: {mapping_file}")
     
+    def _register_file_identifiers(self, file_path: Path, identifiers: Optional[Set[str]],
+                                   error: Optional[str]):
+        """Add a file's identifiers to the mapping, reporting parse errors."""
+        if error:
+            print(f"Error anonymizing {file_path}: {error}")
+        else:
+            self._register_identifiers(identifiers)
+    
+    def _rewrite_file(self, file_path: Path, output_file: Path) -> Optional[str]:
+        """Write the anonymized version of a file whose names are mapped.
+        
+        Returns:
+            Error message, or None on success
+        """
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except Exception as e:
+            return str(e)
+        
+        error = None
+        try:
+            anonymized = self._replace_identifiers(content)
+        except Exception as e:
+            anonymized, error = content, str(e)
+        output_file.write_text(anonymized)
+        return error
+    
     def anonymize_file(self, file_path: Path) -> str:
         """
         Anonymize a single Python file.
@@ -78,106 +247,127 @@ class CodeAnonymizer:
             identifiers = self._collect_identifiers(tree)
             
             # Create anonymization mapping
-            for identifier in identifiers:
-                if identifier not in self.name_mapping:
-                    if self._should_preserve(identifier):
-                        self.name_mapping[identifier] = identifier
-                    else:
-                        self.name_mapping[identifier] = self._generate_anonymous_name(identifier)
+            self._register_identifiers(identifiers)
             
             # Replace identifiers in code
-            anonymized = content
-            # Sort by length (longest first) to avoid partial replacements
-            for original, anonymous in sorted(
-                self.name_mapping.items(),
-                key=lambda x: len(x[0]),
-                reverse=True
-            ):
-                if original != anonymous:
-                    # Use word boundaries to avoid partial replacements
-                    pattern = r'\b' + re.escape(original) + r'\b'
-                    anonymized = re.sub(pattern, anonymous, anonymized)
-            
-            return anonymized
+            return self._replace_identifiers(content)
             
         except Exception as e:
             print(f"Error anonymizing {file_path}: {e}")
             return content
     
-    def _collect_identifiers(self, tree: ast.AST) -> Set[str]:
-        """Collect all identifiers from AST."""
-        identifiers = set()
+    def _register_identifiers(self, identifiers: Set[str]):
+        """Create mapping entries for identifiers seen for the first time.
         
-        for node in ast.walk(tree):
-            # Function and class names
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
-                identifiers.add(node.name)
-            
-            # Variable names
-            elif isinstance(node, ast.Name):
-                identifiers.add(node.id)
-            
-            # Attribute names
-            elif isinstance(node, ast.Attribute):
-                identifiers.add(node.attr)
+        A generated name that was already given to another identifier is
+        regenerated from a longer digest, so two names never merge into one.
+        Identifiers are taken in sorted order, so which of two colliding names
+        gets the longer digest does not depend on set ordering.
+        """
+        for identifier in sorted(identifiers):
+            if identifier in self.name_mapping:
+                continue
+            if self._should_preserve(identifier):
+                self.name_mapping[identifier] = identifier
+                continue
             
-            # Parameter names
-            elif isinstance(node, ast.arg):
-                identifiers.add(node.arg)
+            digest_size = _NAME_DIGEST_SIZE
+            anonymous = self._generate_anonymous_name(identifier, digest_size)
+            while anonymous in self._anonymous_names:
+                digest_size += 2
+                anonymous = self._generate_anonymous_name(identifier, digest_size)
+            self.name_mapping[identifier] = anonymous
+            self._anonymous_names[anonymous] = identifier
+    
+    def _replace_identifiers(self, content: str) -> str:
+        """Rewrite NAME tokens through the mapping in a single tokenize pass.
         
-        return identifiers
+        Strings and comments are left alone, except f-strings on Pythons that
+        tokenize them as a single STRING token.
+        """
+        # Offset of the start of each (1-based) line, to map token positions
+        line_starts = [0, 0]
+        pos = content.find('\n')
+        while pos != -1:
+            line_starts.append(pos + 1)
+            pos = content.find('\n', pos + 1)
+        
+        mapping = self.name_mapping
+        pieces = []
+        last = 0
+        for tok in tokenize.generate_tokens(io.StringIO(content).readline):
+            if tok.type == tokenize.NAME:
+                replacement = mapping.get(tok.string, tok.string)
+            elif tok.type == tokenize.STRING and self._is_fstring(tok.string):
+                replacement = self._replace_in_fstring(tok.string)
+            else:
+                continue
+            if replacement == tok.string:
+                continue
+            row, col = tok.start
+            start = line_starts[row] + col
+            pieces.append(content[last:start])
+            pieces.append(replacement)
+            last = start + len(tok.string)
+        pieces.append(content[last:])
+        
+        return ''.join(pieces)
+    
+    @staticmethod
+    def _is_fstring(token: str) -> bool:
+        """Check if a STRING token is an f-string literal."""
+        prefix = token[:len(token) - len(token.lstrip('rRbBuUfF'))]
+        return 'f' in prefix or 'F' in prefix
+    
+    def _replace_in_fstring(self, token: str) -> str:
+        """Replace mapped identifiers inside an f-string token."""
+        # Each whole word is looked up in the mapping, so the cost depends
+        # on the token's length and not on how many names are mapped
+        mapping = self.name_mapping
+        body = token.lstrip('rRbBuUfF')
+        prefix = token[:len(token) - len(body)]
+        return prefix + _WORD_RE.sub(lambda m: mapping.get(m.group(), m.group()), body)
+    
+    @staticmethod
+    def _collect_identifiers(tree: ast.AST) -> Set[str]:
+        """Collect all identifiers from AST."""
+        collector = _IdentifierCollector()
+        collector.visit(tree)
+        return collector.identifiers
     
     def _should_preserve(self, identifier: str) -> bool:
         """Check if identifier should be preserved."""
-        # Preserve dunder methods
-        if identifier.startswith('__') and identifier.endswith('__'):
-            return True
-        
-        # Preserve single-letter variables (common conventions)
-        if len(identifier) == 1:
-            return True
-        
-        # Preserve common Python keywords/builtins
-        python_builtins = {
-            'True', 'False', 'None', 'self', 'cls',
-            'str', 'int', 'float', 'bool', 'list', 'dict', 'set', 'tuple',
-            'len', 'range', 'enumerate', 'zip', 'map', 'filter',
-            'print', 'open', 'type', 'isinstance', 'hasattr'
-        }
-        if identifier in python_builtins:
-            return True
-        
-        # Preserve stdlib module names if configured
-        if self.preserve_stdlib and identifier in self.stdlib_modules:
-            return True
-        
-        return False
-    
-    def _generate_anonymous_name(self, original: str) -> str:
+        # Builtins, stdlib module names (if configured), single-letter
+        # variables (common conventions) and dunder methods
+        return (
+            identifier in self._preserved_names
+            or len(identifier) == 1
+            or (identifier.startswith('__') and identifier.endswith('__'))
+        )
+    
+    def _generate_anonymous_name(self, original: str, digest_size: int = _NAME_DIGEST_SIZE) -> str:
         """Generate an anonymous name."""
-        # Use hash-based naming for consistency
-        hash_obj = hashlib.md5(original.encode())
-        hash_hex = hash_obj.hexdigest()[:8]
+        # Names depend only on the identifier (and the digest size), so they
+        # are reproducible from one run to the next
+        hash_hex = hashlib.blake2b(original.encode(), digest_size=digest_size).hexdigest()
         
         # Preserve some semantic info through prefixes
-        prefix = ""
         if original[0].isupper():
             prefix = "Class"
-        elif original.startswith('_'):
+        elif original[0] == '_':
             prefix = "private"
         else:
             prefix = "var"
         
-        self.counter += 1
-        return f"{prefix}_{hash_hex}_{self.counter}"
+        return f"{prefix}_{hash_hex}"
     
     def _should_skip(self, path: Path) -> bool:
         """Check if file should be skipped."""
-        skip_patterns = [
-            '__pycache__', '.git', 'venv', 'env', '.venv',
-            'build', 'dist', '.egg-info', 'migrations'
-        ]
-        return any(pattern in str(path) for pattern in skip_patterns)
+        parts = path.parts
+        return (
+            not self._SKIP_PARTS.isdisjoint(parts)
+            or any(part.endswith(self._SKIP_SUFFIXES) for part in parts)
+        )
     
     def _save_mapping(self, mapping_file: Path):
         """Save anonymization mapping to file."""
@@ -202,7 +392,7 @@ class CodeAnonymizer:
         # Count files and LOC
         py_files = list(source_path.rglob("*.py"))
         total_lines = sum(
-            len(f.read_text().splitlines())
+            _count_file_lines(f)
             for f in py_files
             if not self._should_skip(f)
         )
@@ -1,10 +1,27 @@
 """Generate enhanced ASCII architecture diagrams."""
 
+import heapq
+from bisect import bisect_right
+import re
 from typing import List, Dict, Set, Tuple
 from collections import defaultdict
 from .models import ModuleInfo
 
 
+# Module name keywords for each architectural layer, checked in order
+_LAYER_PATTERNS = [
+    ('presentation', re.compile('cli|ui|view|frontend|template')),
+    ('application', re.compile('service|controller|handler|api|workflow')),
+    ('domain', re.compile('model|entity|domain|business')),
+    ('infrastructure', re.compile('database|repository|dao|integration|client')),
+    ('utilities', re.compile('util|helper|common|tool|config')),
+]
+
+# Complexity heatmap colors: below 5, below 10, below 20, and the rest
+_HEAT_THRESHOLDS = (5, 10, 20)
+_HEAT_INDICATORS = ("🟢", "🟡", "🟠", "🔴")
+
+
 class ArchitectureDiagramGenerator:
     """Generate comprehensive architecture diagrams."""
     
@@ -12,6 +29,45 @@ class ArchitectureDiagramGenerator:
         self.modules = modules
         self.module_map = {m.name: m for m in modules}
         
+        # Everything the diagrams need from the modules, gathered in one pass.
+        # Per-module values are parallel lists indexed like self.modules.
+        self._names_lower: List[str] = []
+        self._class_counts: List[int] = []
+        self._function_counts: List[int] = []
+        self._complexities: List[int] = []
+        self._internal_imports: List[Set[str]] = []
+        self._layers: Dict[str, List[str]] = defaultdict(list)
+        self._packages: Dict[str, List[str]] = defaultdict(list)
+        self._dependencies: Dict[str, Set[str]] = defaultdict(set)
+        
+        for module in modules:
+            name_lower = module.name.lower()
+            self._names_lower.append(name_lower)
+            self._class_counts.append(len(module.classes))
+            self._function_counts.append(len(module.functions))
+            self._complexities.append(module.complexity)
+            
+            for layer, pattern in _LAYER_PATTERNS:
+                if pattern.search(name_lower):
+                    self._layers[layer].append(module.name)
+                    break
+            # Default to domain
+            else:
+                self._layers['domain'].append(module.name)
+            
+            # Extract package from path, accepting Windows separators too
+            package, sep, _ = module.file_path.replace('\\', '/').rpartition('/')
+            self._packages[package if sep else 'root'].append(module.name)
+            
+            # Imports that are internal to the project
+            internal = {
+                imp for imp in module.imports
+                if imp in self.module_map or imp.startswith('.')
+            }
+            self._internal_imports.append(internal)
+            if internal:
+                self._dependencies[module.name] |= internal
+    
     def generate_layered_architecture(self) -> List[str]:
         """Generate layered architecture diagram showing application layers."""
         lines = []
@@ -20,8 +76,8 @@ class ArchitectureDiagramGenerator:
         lines.append("└─────────────────────────────────────────────────────────────┘")
         lines.append("")
         
-        # Categorize modules by layer
-        layers = self._categorize_by_layer()
+        # Modules by layer, precomputed in __init__ and only read here
+        layers = self._layers
         
         layer_order = ['presentation', 'application', 'domain', 'infrastructure', 'utilities']
         layer_symbols = {
@@ -85,16 +141,7 @@ class ArchitectureDiagramGenerator:
         lines.append("└─────────────────────────────────────────────────────────────┘")
         lines.append("")
         
-        # Build package tree
-        packages = defaultdict(list)
-        for module in self.modules:
-            # Extract package from path
-            parts = module.file_path.split('/')
-            if len(parts) > 1:
-                package = '/'.join(parts[:-1])
-                packages[package].append(module.name)
-            else:
-                packages['root'].append(module.name)
+        packages = self._packages
         
         # Display tree
         for package in sorted(packages.keys())[:15]:  # Limit to 15 packages
@@ -114,7 +161,7 @@ class ArchitectureDiagramGenerator:
         lines.append("")
         
         # Calculate dependencies
-        deps = self._calculate_dependencies()
+        deps = self._dependencies
         
         # Find modules with most dependencies
         sorted_deps = sorted(deps.items(), key=lambda x: len(x[1]), reverse=True)
@@ -122,9 +169,10 @@ class ArchitectureDiagramGenerator:
         for module_name, dependencies in sorted_deps[:12]:  # Top 12
             if dependencies:
                 lines.append(f"{module_name}")
-                for i, dep in enumerate(sorted(dependencies)[:6]):  # Max 6 deps
-                    is_last = (i == len(list(sorted(dependencies)[:6])) - 1)
-                    connector = "└──>" if is_last else "├──>"
+                shown = sorted(dependencies)[:6]  # Max 6 deps
+                last = len(shown) - 1
+                for i, dep in enumerate(shown):
+                    connector = "└──>" if i == last else "├──>"
                     lines.append(f"  {connector} {dep}")
                 lines.append("")
         
@@ -140,111 +188,63 @@ class ArchitectureDiagramGenerator:
         lines.append("Legend: 🟢 Simple  🟡 Moderate  🟠 Complex  🔴 Very Complex")
         lines.append("")
         
-        # Sort by complexity
-        sorted_modules = sorted(self.modules, key=lambda m: m.complexity, reverse=True)
+        # Top 20 by complexity
+        top = heapq.nlargest(20, range(len(self.modules)), key=self._complexities.__getitem__)
         
-        for module in sorted_modules[:20]:  # Top 20
+        for i in top:
+            name = self.modules[i].name
+            complexity = self._complexities[i]
+            
             # Determine color
-            if module.complexity < 5:
-                indicator = "🟢"
-            elif module.complexity < 10:
-                indicator = "🟡"
-            elif module.complexity < 20:
-                indicator = "🟠"
-            else:
-                indicator = "🔴"
+            indicator = _HEAT_INDICATORS[bisect_right(_HEAT_THRESHOLDS, complexity)]
             
             # Create bar
-            bar_length = min(int(module.complexity / 2), 25)
-            bar = "█" * bar_length
+            bar = "█" * min(int(complexity / 2), 25)
             
-            lines.append(f"{indicator} {module.name:30s} │{bar}│ {module.complexity}")
+            lines.append(f"{indicator} {name:30s} │{bar}│ {complexity}")
         
         lines.append("")
         
         return lines
     
     def _categorize_by_layer(self) -> Dict[str, List[str]]:
-        """Categorize modules by architectural layer."""
-        layers = defaultdict(list)
-        
-        for module in self.modules:
-            name_lower = module.name.lower()
-            path_lower = module.file_path.lower()
-            
-            # Presentation layer
-            if any(x in name_lower for x in ['cli', 'ui', 'view', 'frontend', 'template']):
-                layers['presentation'].append(module.name)
-            # Application layer
-            elif any(x in name_lower for x in ['service', 'controller', 'handler', 'api', 'workflow']):
-                layers['application'].append(module.name)
-            # Domain layer
-            elif any(x in name_lower for x in ['model', 'entity', 'domain', 'business']):
-                layers['domain'].append(module.name)
-            # Infrastructure layer
-            elif any(x in name_lower for x in ['database', 'repository', 'dao', 'integration', 'client']):
-                layers['infrastructure'].append(module.name)
-            # Utilities
-            elif any(x in name_lower for x in ['util', 'helper', 'common', 'tool', 'config']):
-                layers['utilities'].append(module.name)
-            # Default to domain
-            else:
-                layers['domain'].append(module.name)
+        """Categorize modules by architectural layer.
         
-        return layers
+        Returns a copy, so callers may modify it without affecting later diagrams.
+        """
+        return {layer: list(names) for layer, names in self._layers.items()}
     
     def _identify_key_components(self) -> List[Tuple[str, Dict]]:
         """Identify key components by importance."""
-        components = []
+        # Calculate importance scores
+        scores = [
+            classes * 3 + functions + complexity * 0.5
+            for classes, functions, complexity
+            in zip(self._class_counts, self._function_counts, self._complexities)
+        ]
         
-        for module in self.modules:
-            # Calculate importance score
-            score = (
-                len(module.classes) * 3 +
-                len(module.functions) * 1 +
-                module.complexity * 0.5
-            )
-            
+        # Sort by score
+        order = sorted(range(len(self.modules)), key=scores.__getitem__, reverse=True)
+        
+        components = []
+        for i in order:
+            module = self.modules[i]
             comp_info = {
-                'classes': len(module.classes),
-                'functions': len(module.functions),
-                'complexity': module.complexity,
-                'dependencies': self._get_module_dependencies(module)
+                'classes': self._class_counts[i],
+                'functions': self._function_counts[i],
+                'complexity': self._complexities[i],
+                'dependencies': sorted(self._internal_imports[i])[:5]  # Limit to 5
             }
-            
             components.append((module.name, comp_info))
         
-        # Sort by score
-        components.sort(key=lambda x: (
-            x[1]['classes'] * 3 + 
-            x[1]['functions'] + 
-            x[1]['complexity'] * 0.5
-        ), reverse=True)
-        
         return components
     
-    def _get_module_dependencies(self, module: ModuleInfo) -> List[str]:
-        """Get dependencies for a module."""
-        deps = set()
-        
-        # Get imports that are internal to the project
-        for imp in module.imports:
-            if imp.startswith('.') or imp in self.module_map:
-                deps.add(imp)
-        
-        return sorted(list(deps))[:5]  # Limit to 5
-    
     def _calculate_dependencies(self) -> Dict[str, Set[str]]:
-        """Calculate all module dependencies."""
-        deps = defaultdict(set)
-        
-        for module in self.modules:
-            for imp in module.imports:
-                # Check if it's an internal import
-                if imp in self.module_map or imp.startswith('.'):
-                    deps[module.name].add(imp)
+        """Calculate all module dependencies.
         
-        return deps
+        Returns a copy, so callers may modify it without affecting later diagrams.
+        """
+        return {name: set(deps) for name, deps in self._dependencies.items()}
 
 
 def format_architecture_diagrams(modules: List[ModuleInfo]) -> str:
@@ -0,0 +1,181 @@
+"""On-disk cache of per-file analysis results.
+
+Results live in a SQLite database keyed by (project root, file path, content
+hash), so unchanged files can skip parsing entirely on subsequent runs. The
+root is part of the key because module names and paths in a result are
+relative to it. The file's mtime and size are stored alongside each entry and
+checked first, letting untouched files skip reading and hashing as well.
+Entries written by a different package version or cache schema are ignored,
+which invalidates the cache on upgrade.
+Each file keeps only its latest entry per root, and entries for files that
+have left the project are pruned after every run.
+"""
+
+import hashlib
+import os
+import pickle
+import sqlite3
+from pathlib import Path
+from typing import Iterable, Optional
+
+try:
+    import xxhash
+    HAS_XXHASH = True
+except ImportError:
+    HAS_XXHASH = False
+
+try:
+    import blake3
+    HAS_BLAKE3 = True
+except ImportError:
+    HAS_BLAKE3 = False
+
+from . import __version__
+from .models import ModuleInfo
+
+
+DEFAULT_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "code-analyzer"
+
+# Bump whenever a change alters the ModuleInfo produced for a file, so results
+# cached by an earlier build are not served again
+_CACHE_SCHEMA = 1
+
+# Version stored with every entry; only entries with this version are read
+_CACHE_VERSION = f"{__version__}+{_CACHE_SCHEMA}"
+
+# Layout of the modules table; databases with another layout are recreated
+_TABLE_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS modules (
+    root TEXT NOT NULL,
+    path TEXT NOT NULL,
+    sha TEXT NOT NULL,
+    version TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    blob BLOB NOT NULL,
+    PRIMARY KEY (root, path, sha)
+)
+"""
+
+
+class AstCache:
+    """Content-addressed store of ModuleInfo results."""
+
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR):
+        """
+        Initialize cache in a directory.
+
+        Args:
+            cache_dir: Directory holding the cache database
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.cache_dir / "ast_cache.sqlite3"
+        # Several benchmark processes may share one database
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30)
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] != _TABLE_VERSION:
+            self._conn.execute("DROP TABLE IF EXISTS modules")
+            self._conn.execute(f"PRAGMA user_version = {_TABLE_VERSION}")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(content: bytes) -> str:
+        """Hash a file's raw contents.
+
+        Keys only detect changes, so the fastest available hash is used:
+        xxh3_128, then BLAKE3, then the stdlib's blake2b.
+        """
+        if HAS_XXHASH:
+            return xxhash.xxh3_128_hexdigest(content)
+        if HAS_BLAKE3:
+            return blake3.blake3(content).hexdigest()
+        return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+    def get_unchanged(self, root: str, path: str, mtime_ns: int, size: int) -> Optional[ModuleInfo]:
+        """Return the result stored for a file whose mtime and size still match."""
+        return self._load(
+            "SELECT blob FROM modules"
+            " WHERE root = ? AND path = ? AND mtime_ns = ? AND size = ? AND version = ?",
+            (root, path, mtime_ns, size, _CACHE_VERSION),
+        )
+
+    def get(self, root: str, path: str, key: str) -> Optional[ModuleInfo]:
+        """Return the cached result for a file's contents, or None on a miss."""
+        return self._load(
+            "SELECT blob FROM modules WHERE root = ? AND path = ? AND sha = ? AND version = ?",
+            (root, path, key, _CACHE_VERSION),
+        )
+
+    def put(self, root: str, path: str, key: str, mtime_ns: int, size: int,
+            module_info: ModuleInfo):
+        """Store a result, replacing older contents of the same file.
+
+        Changes are written to disk by commit().
+
+        Args:
+            root: Project directory the result was analyzed from
+            path: Absolute path of the file
+            key: Hash of the file's contents from make_key()
+            mtime_ns: File modification time in nanoseconds
+            size: File size in bytes
+            module_info: Analysis result to store
+        """
+        try:
+            self._conn.execute(
+                "DELETE FROM modules WHERE root = ? AND path = ? AND sha != ?", (root, path, key)
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO modules VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (root, path, key, _CACHE_VERSION, mtime_ns, size,
+                 pickle.dumps(module_info, protocol=pickle.HIGHEST_PROTOCOL)),
+            )
+        except sqlite3.Error:
+            pass
+
+    def touch(self, root: str, path: str, key: str, mtime_ns: int, size: int):
+        """Record a new mtime and size for an entry whose contents are unchanged."""
+        try:
+            self._conn.execute(
+                "UPDATE modules SET mtime_ns = ?, size = ? WHERE root = ? AND path = ? AND sha = ?",
+                (mtime_ns, size, root, path, key),
+            )
+        except sqlite3.Error:
+            pass
+
+    def prune(self, root: str, live_paths: Iterable[str]):
+        """Drop entries stored for root whose files are not in live_paths.
+
+        Args:
+            root: Project directory whose entries are checked
+            live_paths: Paths of the files found in the current run
+        """
+        live = set(live_paths)
+        try:
+            stale = [
+                (root, path) for (path,) in self._conn.execute(
+                    "SELECT DISTINCT path FROM modules WHERE root = ?", (root,)
+                )
+                if path not in live
+            ]
+            if stale:
+                self._conn.executemany("DELETE FROM modules WHERE root = ? AND path = ?", stale)
+        except sqlite3.Error:
+            pass
+
+    def commit(self):
+        """Write all pending changes in a single transaction."""
+        try:
+            self._conn.commit()
+        except sqlite3.Error:
+            self._conn.rollback()
+
+    def _load(self, query: str, params: tuple) -> Optional[ModuleInfo]:
+        """Run a single-row blob query and unpickle the result."""
+        try:
+            row = self._conn.execute(query, params).fetchone()
+            return pickle.loads(row[0]) if row else None
+        except (sqlite3.Error, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
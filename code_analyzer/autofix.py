@@ -1,59 +1,146 @@
 """Automatic code fix generation for common issues."""
 
 import ast
+import difflib
+import functools
+import io
+import os
 import re
-from typing import List, Dict, Optional, Tuple
+from itertools import repeat
+from typing import List, Dict, FrozenSet, Optional, Sequence, Tuple
 from pathlib import Path
 from dataclasses import dataclass
 
 from .models import Issue, IssueType
 
 
+# Single-line import statements removed by the regex fallback
+_IMPORT_LINE_RE = re.compile(r'^(import\s+\w+|from\s+\w+\s+import\s+\w+)')
+
+# Variable name quoted in an unused-variable issue description
+_VARIABLE_IN_DESCRIPTION_RE = re.compile(r"variable[:\s]+['\"]?(\w+)['\"]?")
+
+# Hunk header of a unified diff, with the start line of each side captured
+_HUNK_HEADER_RE = re.compile(r'^@@ -(\d+)(,\d+)? \+(\d+)(,\d+)? @@')
+
+# Context lines around each change, as in difflib.unified_diff
+_DIFF_CONTEXT = 3
+
+# Order in which fixes of each confidence are applied
+_CONFIDENCE_ORDER = {'high': 0, 'medium': 1, 'low': 2}
+
+
+@functools.lru_cache(maxsize=1024)
+def _word_re(name: str) -> "re.Pattern[str]":
+    """Return a pattern matching a name as a whole word."""
+    return re.compile(rf'\b{re.escape(name)}\b')
+
+
+# A change to a file's lines: (start, end, replacement lines), replacing
+# original lines [start, end). Insertions have start == end.
+LineEdit = Tuple[int, int, Tuple[str, ...]]
+
+
 @dataclass
 class CodeFix:
-    """Represents a code fix."""
+    """Represents a code fix.
+    
+    A fix keeps the line edits it makes rather than a whole fixed copy of
+    the file; original_code is shared by every fix for the same file.
+    """
     issue: Issue
     file_path: str
     original_code: str
-    fixed_code: str
+    edits: Tuple[LineEdit, ...]
     description: str
     confidence: str  # 'high', 'medium', 'low'
     
+    @property
+    def fixed_code(self) -> str:
+        """The file's source with this fix applied."""
+        return _apply_line_edits(_source_lines(self.original_code), self.edits)
+    
     def generate_diff(self) -> str:
         """Generate unified diff for preview."""
-        import difflib
+        if not self.edits:
+            return ''
+        
+        original_lines = _source_lines(self.original_code)
+        fixed_lines = _edited_lines(original_lines, self.edits)
         
-        original_lines = self.original_code.splitlines(keepends=True)
-        fixed_lines = self.fixed_code.splitlines(keepends=True)
+        # Only diff the changed window plus its context; fixes usually touch
+        # a few lines, so the unchanged head and tail need no matching.
+        shortest = min(len(original_lines), len(fixed_lines))
+        head = 0
+        while head < shortest and original_lines[head] == fixed_lines[head]:
+            head += 1
+        tail = 0
+        while (tail < shortest - head
+               and original_lines[-1 - tail] == fixed_lines[-1 - tail]):
+            tail += 1
+        
+        start = max(head - _DIFF_CONTEXT, 0)
+        keep = max(tail - _DIFF_CONTEXT, 0)
         
         diff = difflib.unified_diff(
-            original_lines,
-            fixed_lines,
+            original_lines[start:len(original_lines) - keep],
+            fixed_lines[start:len(fixed_lines) - keep],
             fromfile=f"a/{self.file_path}",
             tofile=f"b/{self.file_path}",
             lineterm=''
         )
         
-        return ''.join(diff)
+        if not start:
+            return ''.join(diff)
+        
+        # Shift hunk headers back to positions in the whole file
+        def shift(match: re.Match) -> str:
+            return (
+                f"@@ -{int(match.group(1)) + start}{match.group(2) or ''} "
+                f"+{int(match.group(3)) + start}{match.group(4) or ''} @@"
+            )
+        
+        return ''.join(_HUNK_HEADER_RE.sub(shift, line, count=1) for line in diff)
 
 
 class UnusedImportRemover(ast.NodeTransformer):
     """Remove unused imports from AST."""
     
     def __init__(self, used_names: set):
-        self.used_names = used_names
+        self.used_names = used_names if isinstance(used_names, frozenset) else frozenset(used_names)
         self.removed_imports = []
+        # (statement, removed entirely) for every import that lost names
+        self.edited_imports: List[Tuple[ast.stmt, bool]] = []
+        # Removed imports whose block would otherwise be left empty
+        self.replaced_by_pass: List[ast.stmt] = []
+    
+    def generic_visit(self, node):
+        """Visit children, keeping blocks emptied by removals valid."""
+        blocks = [
+            (field, list(value)) for field, value in ast.iter_fields(node)
+            if field in ('body', 'orelse', 'finalbody') and value
+        ]
+        node = super().generic_visit(node)
+        if not isinstance(node, ast.Module):
+            for field, original in blocks:
+                if not getattr(node, field):
+                    setattr(node, field, [ast.Pass()])
+                    self.replaced_by_pass.append(original[0])
+        return node
     
     def visit_Import(self, node):
         """Remove unused import statements."""
+        used_names = self.used_names
         new_names = []
         for alias in node.names:
             name = alias.asname if alias.asname else alias.name
-            if name in self.used_names or name.split('.')[0] in self.used_names:
+            if name in used_names or ('.' in name and name.partition('.')[0] in used_names):
                 new_names.append(alias)
             else:
                 self.removed_imports.append(alias.name)
         
+        if len(new_names) < len(node.names):
+            self.edited_imports.append((node, not new_names))
         if new_names:
             node.names = new_names
             return node
@@ -61,50 +148,238 @@ class UnusedImportRemover(ast.NodeTransformer):
     
     def visit_ImportFrom(self, node):
         """Remove unused from-imports."""
+        used_names = self.used_names
         new_names = []
         for alias in node.names:
             name = alias.asname if alias.asname else alias.name
-            if name in self.used_names:
+            if name in used_names:
                 new_names.append(alias)
             else:
                 self.removed_imports.append(f"{node.module}.{alias.name}")
         
+        if len(new_names) < len(node.names):
+            self.edited_imports.append((node, not new_names))
         if new_names:
             node.names = new_names
             return node
         return None
 
 
+@dataclass
+class _FileAnalysis:
+    """What the fixers need to know about one module."""
+    used_names: FrozenSet[str]
+    # Function and class definitions by the line of their def/class keyword
+    defs_by_line: Dict[int, ast.AST]
+
+
+class _FileAnalyzer(ast.NodeVisitor):
+    """Gather everything in _FileAnalysis in a single walk of a module.
+    
+    Only Name nodes carry identifiers here; the base of an attribute access
+    like os.path is a Name itself, so it is collected on the way down.
+    """
+    
+    def __init__(self):
+        self.used_names = set()
+        self.defs_by_line: Dict[int, ast.AST] = {}
+    
+    def visit_Name(self, node):
+        self.used_names.add(node.id)
+    
+    def visit_FunctionDef(self, node):
+        self.defs_by_line.setdefault(node.lineno, node)
+        self.generic_visit(node)
+    
+    visit_AsyncFunctionDef = visit_FunctionDef
+    visit_ClassDef = visit_FunctionDef
+
+
+# Parsed sources are cached by content, so every issue in a file shares one
+# parse. Cached trees must not be modified; transforms parse their own copy.
+@functools.lru_cache(maxsize=512)
+def _parse_source(code: str) -> ast.Module:
+    """Parse source code once per distinct content."""
+    return ast.parse(code)
+
+
+def _split_lines(code: str) -> List[str]:
+    """Split source code into lines, with line endings, as the parser does.
+    
+    Only \\n, \\r\\n and \\r end a line, unlike str.splitlines, which also
+    breaks on form feeds and other separators and would misalign line
+    indices with AST line numbers.
+    """
+    return io.StringIO(code, newline='').readlines()
+
+
+@functools.lru_cache(maxsize=512)
+def _source_lines(code: str) -> Tuple[str, ...]:
+    """Split source code into lines, with line endings, once per content."""
+    return tuple(_split_lines(code))
+
+
+@functools.lru_cache(maxsize=512)
+def _analyze_source(code: str) -> _FileAnalysis:
+    """Walk a module once for all of its fixes."""
+    analyzer = _FileAnalyzer()
+    analyzer.visit(_parse_source(code))
+    return _FileAnalysis(frozenset(analyzer.used_names), analyzer.defs_by_line)
+
+
+@functools.lru_cache(maxsize=512)
+def _remove_unused_imports(code: str) -> Tuple[Tuple[LineEdit, ...], Tuple[str, ...]]:
+    """Remove every unused import from a module.
+    
+    Returns:
+        Tuple of (line edits, names of removed imports)
+    """
+    remover = UnusedImportRemover(_analyze_source(code).used_names)
+    new_tree = remover.visit(ast.parse(code))
+    if not remover.removed_imports:
+        return (), ()
+    
+    # Splice the edited statements out of the original text so the rest of
+    # the file keeps its formatting and comments. Fall back to regenerating
+    # the whole module when that is not possible or would not parse, e.g.
+    # an import sharing its line with other statements.
+    fixed_code = _splice_imports(list(_source_lines(code)), remover.edited_imports,
+                                 remover.replaced_by_pass)
+    if fixed_code is not None:
+        try:
+            ast.parse(fixed_code)
+        except SyntaxError:
+            fixed_code = None
+    if fixed_code is None:
+        ast.fix_missing_locations(new_tree)
+        fixed_code = ast.unparse(new_tree)
+    edits = _line_edits(_source_lines(code), _split_lines(fixed_code))
+    return tuple(edits), tuple(remover.removed_imports)
+
+
+def _splice_imports(lines: List[str], edited_imports: List[Tuple[ast.stmt, bool]],
+                    replaced_by_pass: List[ast.stmt]) -> Optional[str]:
+    """Drop removed import statements and rewrite trimmed ones in place.
+    
+    A removed import that was its block's first statement becomes "pass"
+    when the whole block was removed.
+    
+    Returns:
+        The new source, or None if a statement does not own its lines
+    """
+    pass_ids = {id(node) for node in replaced_by_pass}
+    for node, removed in sorted(edited_imports, key=lambda e: e[0].lineno, reverse=True):
+        start, end = node.lineno - 1, node.end_lineno
+        # AST column offsets count UTF-8 bytes
+        head = lines[start].encode()[:node.col_offset].decode()
+        tail = lines[end - 1].encode()[node.end_col_offset:].decode()
+        if head.strip() or (tail.strip() and not tail.lstrip().startswith('#')):
+            return None
+        if not removed:
+            lines[start:end] = [head + ast.unparse(node) + tail]
+        elif id(node) in pass_ids:
+            lines[start:end] = [head + 'pass' + tail]
+        else:
+            lines[start:end] = []
+    return ''.join(lines)
+
+
+def _generate_file_fixes(file_path: str, issues: List[Issue],
+                         project_path: Path) -> List[Optional[CodeFix]]:
+    """Generate fixes for one file's issues, None where an issue has none.
+    
+    Module-level so it can run in a worker process.
+    """
+    original_code = AutoFixGenerator._read_source(project_path / file_path)
+    if original_code is None:
+        return []
+    generator = AutoFixGenerator()
+    return [generator._generate_fix_for_issue(issue, project_path, original_code) for issue in issues]
+
+
 class AutoFixGenerator:
     """Generate automatic fixes for common code issues."""
     
     def __init__(self):
         self.fixes: List[CodeFix] = []
     
-    def generate_fixes(self, issues: List[Issue], project_path: Path) -> List[CodeFix]:
-        """Generate fixes for all applicable issues."""
-        self.fixes = []
+    def generate_fixes(self, issues: List[Issue], project_path: Path,
+                       workers: Optional[int] = 1) -> List[CodeFix]:
+        """Generate fixes for all applicable issues.
+        
+        Issues are grouped by file so each file is read and parsed once, and
+        files are spread over worker processes when workers allows it.
         
-        for issue in issues:
-            fix = self._generate_fix_for_issue(issue, project_path)
-            if fix:
-                self.fixes.append(fix)
+        Args:
+            issues: Issues to generate fixes for
+            project_path: Project root the issues' file paths are relative to
+            workers: Number of processes used to generate fixes. 1 works in
+                this process, None uses one process per CPU.
         
+        Returns:
+            Fixes in the order of the issues they fix
+        """
+        # Issue indices per file, in order of first appearance
+        issues_by_file: Dict[str, List[int]] = {}
+        for index, issue in enumerate(issues):
+            issues_by_file.setdefault(issue.location.file_path, []).append(index)
+        
+        file_paths = list(issues_by_file)
+        file_issues = [[issues[i] for i in indices] for indices in issues_by_file.values()]
+        
+        workers = workers or os.cpu_count() or 1
+        
+        if workers <= 1 or len(file_paths) <= 1:
+            results = map(_generate_file_fixes, file_paths, file_issues, repeat(project_path))
+            fixes = self._collect_fixes(len(issues), issues_by_file.values(), results)
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            
+            chunksize = max(1, len(file_paths) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = executor.map(_generate_file_fixes, file_paths, file_issues,
+                                       repeat(project_path), chunksize=chunksize)
+                fixes = self._collect_fixes(len(issues), issues_by_file.values(), results)
+        
+        self.fixes = fixes
         return self.fixes
     
-    def _generate_fix_for_issue(self, issue: Issue, project_path: Path) -> Optional[CodeFix]:
-        """Generate fix for a single issue."""
-        # Parse file path from location
-        file_path = issue.location.file_path
-        full_path = project_path / file_path
-        
+    @staticmethod
+    def _collect_fixes(issue_count: int, indices_by_file, results) -> List[CodeFix]:
+        """Put per-file fixes back in issue order, dropping issues without one."""
+        fixes_at: List[Optional[CodeFix]] = [None] * issue_count
+        for indices, file_fixes in zip(indices_by_file, results):
+            for index, fix in zip(indices, file_fixes):
+                fixes_at[index] = fix
+        return [fix for fix in fixes_at if fix]
+    
+    @staticmethod
+    def _read_source(full_path: Path) -> Optional[str]:
+        """Read a file's source, or None if it is missing or unreadable."""
         if not full_path.exists():
             return None
         
         try:
-            original_code = full_path.read_text()
+            return full_path.read_text()
         except Exception:
             return None
+    
+    def _generate_fix_for_issue(self, issue: Issue, project_path: Path,
+                                original_code: Optional[str] = None) -> Optional[CodeFix]:
+        """Generate fix for a single issue.
+        
+        Args:
+            issue: Issue to fix
+            project_path: Project root the issue's file path is relative to
+            original_code: Contents of the issue's file if already read
+        """
+        # Parse file path from location
+        file_path = issue.location.file_path
+        
+        if original_code is None:
+            original_code = self._read_source(project_path / file_path)
+            if original_code is None:
+                return None
         
         # Route to specific fix generator based on issue type
         if issue.issue_type == IssueType.UNUSED_CODE:
@@ -126,59 +401,38 @@ class AutoFixGenerator:
     def _fix_unused_import(self, issue: Issue, file_path: str, original_code: str) -> Optional[CodeFix]:
         """Fix unused import by removing it."""
         try:
-            tree = ast.parse(original_code)
-            
-            # Collect all used names
-            used_names = set()
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Name):
-                    used_names.add(node.id)
-                elif isinstance(node, ast.Attribute):
-                    if isinstance(node.value, ast.Name):
-                        used_names.add(node.value.id)
-            
-            # Remove unused imports
-            remover = UnusedImportRemover(used_names)
-            new_tree = remover.visit(tree)
-            ast.fix_missing_locations(new_tree)
-            
-            if remover.removed_imports:
-                fixed_code = ast.unparse(new_tree)
-                
-                return CodeFix(
-                    issue=issue,
-                    file_path=file_path,
-                    original_code=original_code,
-                    fixed_code=fixed_code,
-                    description=f"Removed unused imports: {', '.join(remover.removed_imports)}",
-                    confidence='high'
-                )
+            # The same removal serves every unused-import issue in the file
+            edits, removed_imports = _remove_unused_imports(original_code)
         except Exception as e:
             # If AST manipulation fails, try simple regex for single-line imports
             return self._fix_unused_import_regex(issue, file_path, original_code)
         
+        if removed_imports:
+            return CodeFix(
+                issue=issue,
+                file_path=file_path,
+                original_code=original_code,
+                edits=edits,
+                description=f"Removed unused imports: {', '.join(removed_imports)}",
+                confidence='high'
+            )
+        
         return None
     
     def _fix_unused_import_regex(self, issue: Issue, file_path: str, original_code: str) -> Optional[CodeFix]:
         """Fallback: use regex to remove single-line unused imports."""
-        # Extract import statement from issue description
-        import_pattern = r'^(import\s+\w+|from\s+\w+\s+import\s+\w+)'
-        
-        lines = original_code.splitlines(keepends=True)
+        lines = _source_lines(original_code)
         line_start = issue.location.line_start - 1
         
         if 0 <= line_start < len(lines):
             line = lines[line_start]
-            if re.search(import_pattern, line.strip()):
+            if _IMPORT_LINE_RE.search(line.strip()):
                 # Remove this line
-                new_lines = lines[:line_start] + lines[line_start+1:]
-                fixed_code = ''.join(new_lines)
-                
                 return CodeFix(
                     issue=issue,
                     file_path=file_path,
                     original_code=original_code,
-                    fixed_code=fixed_code,
+                    edits=((line_start, line_start + 1, ()),),
                     description=f"Removed unused import at line {issue.location.line_start}",
                     confidence='medium'
                 )
@@ -187,28 +441,27 @@ class AutoFixGenerator:
     
     def _fix_unused_variable(self, issue: Issue, file_path: str, original_code: str) -> Optional[CodeFix]:
         """Fix unused variable by adding underscore prefix."""
-        lines = original_code.splitlines(keepends=True)
+        lines = _source_lines(original_code)
         line_idx = issue.location.line_start - 1
         
         if 0 <= line_idx < len(lines):
             line = lines[line_idx]
             
             # Find variable name in issue title/description
-            var_match = re.search(r"variable[:\s]+['\"]?(\w+)['\"]?", issue.description)
+            var_match = _VARIABLE_IN_DESCRIPTION_RE.search(issue.description)
             if var_match:
                 var_name = var_match.group(1)
                 
                 # Replace first occurrence on that line with underscore prefix
-                if re.search(rf'\b{var_name}\b', line):
-                    new_line = re.sub(rf'\b{var_name}\b', f'_{var_name}', line, count=1)
-                    new_lines = lines[:line_idx] + [new_line] + lines[line_idx+1:]
-                    fixed_code = ''.join(new_lines)
+                word_re = _word_re(var_name)
+                if word_re.search(line):
+                    new_line = word_re.sub(f'_{var_name}', line, count=1)
                     
                     return CodeFix(
                         issue=issue,
                         file_path=file_path,
                         original_code=original_code,
-                        fixed_code=fixed_code,
+                        edits=((line_idx, line_idx + 1, (new_line,)),),
                         description=f"Prefixed unused variable '{var_name}' with underscore",
                         confidence='high'
                     )
@@ -218,36 +471,33 @@ class AutoFixGenerator:
     def _fix_missing_docstring(self, issue: Issue, file_path: str, original_code: str) -> Optional[CodeFix]:
         """Add missing docstring to function or class."""
         try:
-            tree = ast.parse(original_code)
-            lines = original_code.splitlines(keepends=True)
-            
             # Find the function/class at the issue location
-            target_line = issue.location.line_start
-            
-            for node in ast.walk(tree):
-                if isinstance(node, (ast.FunctionDef, ast.ClassDef, ast.AsyncFunctionDef)):
-                    if node.lineno == target_line:
-                        # Generate docstring
-                        indent = self._get_indent(lines[node.lineno])
-                        
-                        if isinstance(node, ast.ClassDef):
-                            docstring = f'{indent}    """TODO: Document this class."""\n'
-                        else:
-                            docstring = f'{indent}    """TODO: Document this function."""\n'
-                        
-                        # Insert after function/class definition line
-                        insert_line = node.lineno  # Insert after the def/class line
-                        new_lines = lines[:insert_line] + [docstring] + lines[insert_line:]
-                        fixed_code = ''.join(new_lines)
-                        
-                        return CodeFix(
-                            issue=issue,
-                            file_path=file_path,
-                            original_code=original_code,
-                            fixed_code=fixed_code,
-                            description=f"Added placeholder docstring to {node.name}",
-                            confidence='medium'
-                        )
+            node = _analyze_source(original_code).defs_by_line.get(issue.location.line_start)
+            if node is not None:
+                lines = _source_lines(original_code)
+                
+                # Insert before the first statement of the body, at its
+                # indentation; a body on the def/class line is left alone
+                first = node.body[0]
+                insert_line = first.lineno - 1
+                indent = self._get_indent(lines[insert_line])
+                if insert_line < node.lineno or len(indent) != first.col_offset:
+                    return None
+                
+                # Generate docstring
+                if isinstance(node, ast.ClassDef):
+                    docstring = f'{indent}"""TODO: Document this class."""\n'
+                else:
+                    docstring = f'{indent}"""TODO: Document this function."""\n'
+                
+                return CodeFix(
+                    issue=issue,
+                    file_path=file_path,
+                    original_code=original_code,
+                    edits=((insert_line, insert_line, (docstring,)),),
+                    description=f"Added placeholder docstring to {node.name}",
+                    confidence='medium'
+                )
         except Exception:
             pass
         
@@ -263,7 +513,7 @@ class AutoFixGenerator:
     
     def _fix_constant_condition(self, issue: Issue, file_path: str, original_code: str) -> Optional[CodeFix]:
         """Remove if statements with constant conditions."""
-        lines = original_code.splitlines(keepends=True)
+        lines = _source_lines(original_code)
         line_idx = issue.location.line_start - 1
         
         if 0 <= line_idx < len(lines):
@@ -273,14 +523,12 @@ class AutoFixGenerator:
                 # Remove the if statement, keep the body (simplified)
                 indent = len(line) - len(line.lstrip())
                 new_line = ' ' * indent + '# Fixed: removed redundant "if True:"\n'
-                new_lines = lines[:line_idx] + [new_line] + lines[line_idx+1:]
-                fixed_code = ''.join(new_lines)
                 
                 return CodeFix(
                     issue=issue,
                     file_path=file_path,
                     original_code=original_code,
-                    fixed_code=fixed_code,
+                    edits=((line_idx, line_idx + 1, (new_line,)),),
                     description="Removed redundant constant condition",
                     confidence='low'
                 )
@@ -292,7 +540,15 @@ class AutoFixGenerator:
         return line[:len(line) - len(line.lstrip())]
     
     def apply_fixes(self, fixes: List[CodeFix], project_path: Path) -> Dict[str, int]:
-        """Apply fixes to files."""
+        """Apply fixes to files, writing each file once.
+        
+        Every fix holds line edits against the same original source. Edits
+        from different fixes are combined, highest confidence first; a fix
+        whose edits overlap ones already taken is counted as failed.
+        
+        Returns:
+            Number of fixes applied and failed
+        """
         stats = {'applied': 0, 'failed': 0}
         
         # Group fixes by file
@@ -304,16 +560,79 @@ class AutoFixGenerator:
         
         # Apply fixes file by file
         for file_path, file_fixes in fixes_by_file.items():
-            # Sort by confidence and apply highest confidence fix for each file
-            file_fixes.sort(key=lambda f: {'high': 0, 'medium': 1, 'low': 2}[f.confidence])
+            file_fixes.sort(key=lambda f: _CONFIDENCE_ORDER[f.confidence])
+            
+            original_code = file_fixes[0].original_code
+            original_lines = _source_lines(original_code)
+            edits: List[LineEdit] = []
+            taken = set()  # edit sets already merged
+            applied = failed = 0
+            
+            for fix in file_fixes:
+                if fix.edits in taken:
+                    # Several issues can yield the same whole-file fix
+                    applied += 1
+                    continue
+                if fix.original_code != original_code:
+                    failed += 1
+                    continue
+                
+                if any(_edits_overlap(edit, other) for edit in fix.edits for other in edits):
+                    failed += 1
+                    continue
+                
+                edits.extend(fix.edits)
+                taken.add(fix.edits)
+                applied += 1
             
-            best_fix = file_fixes[0]
             full_path = project_path / file_path
             
             try:
-                full_path.write_text(best_fix.fixed_code)
-                stats['applied'] += 1
+                full_path.write_text(_apply_line_edits(original_lines, edits))
+                stats['applied'] += applied
+                stats['failed'] += failed
             except Exception:
-                stats['failed'] += 1
+                stats['failed'] += len(file_fixes)
         
         return stats
+
+
+def _line_edits(original_lines: Sequence[str], fixed_lines: Sequence[str]) -> List[LineEdit]:
+    """Describe a fix as (start, end, replacement) edits of the original lines."""
+    matcher = difflib.SequenceMatcher(None, original_lines, fixed_lines, autojunk=False)
+    return [
+        (i1, i2, tuple(fixed_lines[j1:j2]))
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != 'equal'
+    ]
+
+
+def _edits_overlap(a: LineEdit, b: LineEdit) -> bool:
+    """Check whether two line edits touch the same part of the original."""
+    a_start, a_end = a[0], a[1]
+    b_start, b_end = b[0], b[1]
+    if a_start == a_end and b_start == b_end:
+        # Two insertions only clash at the same position
+        return a_start == b_start
+    if a_start == a_end:
+        return b_start < a_start < b_end
+    if b_start == b_end:
+        return a_start < b_start < a_end
+    return a_start < b_end and b_start < a_end
+
+
+def _edited_lines(original_lines: Sequence[str], edits: Sequence[LineEdit]) -> List[str]:
+    """Apply non-overlapping line edits in one pass over the original."""
+    result = []
+    cursor = 0
+    for start, end, replacement in sorted(edits, key=lambda e: (e[0], e[1])):
+        result.extend(original_lines[cursor:start])
+        result.extend(replacement)
+        cursor = end
+    result.extend(original_lines[cursor:])
+    return result
+
+
+def _apply_line_edits(original_lines: Sequence[str], edits: Sequence[LineEdit]) -> str:
+    """Apply non-overlapping line edits and join the result into source."""
+    return ''.join(_edited_lines(original_lines, edits))
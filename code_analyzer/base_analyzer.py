@@ -1,5 +1,6 @@
 """Base interface for language-specific analyzers."""
 
+import os
 from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import List, Optional
@@ -57,8 +58,40 @@ class PythonAnalyzerAdapter(LanguageAnalyzer):
         self.analyzer = analyzer_instance
     
     def analyze_file(self, file_path: Path) -> Optional[ModuleInfo]:
-        """Analyze a Python file."""
-        return self.analyzer._analyze_file(file_path)
+        """Analyze a Python file, reusing the analyzer's cached result if any.
+        
+        As in a full analysis, a file whose mtime and size are unchanged is
+        served without reading it, and one that was only touched is matched
+        by the hash of its contents.
+        """
+        cache = self.analyzer.cache
+        if cache is None:
+            return self.analyzer._analyze_file(file_path)
+        
+        # Same key as a full analysis: the analyzer's root, since results name
+        # modules relative to it, and the resolved absolute path
+        root = str(self.analyzer.project_path)
+        path = str(Path(file_path).resolve())
+        try:
+            stat = os.stat(file_path)
+            module_info = cache.get_unchanged(root, path, stat.st_mtime_ns, stat.st_size)
+            if module_info is not None:
+                return module_info
+            data = Path(file_path).read_bytes()
+        except OSError:
+            return self.analyzer._analyze_file(file_path)
+        
+        key = cache.make_key(data)
+        module_info = cache.get(root, path, key)
+        if module_info is not None:
+            cache.touch(root, path, key, stat.st_mtime_ns, stat.st_size)
+        else:
+            module_info = self.analyzer._analyze_file(file_path, data)
+            if module_info is None:
+                return None
+            cache.put(root, path, key, stat.st_mtime_ns, stat.st_size, module_info)
+        cache.commit()
+        return module_info
     
     def get_supported_extensions(self) -> List[str]:
         """Return Python file extensions."""
@@ -1,10 +1,51 @@
 """Call graph generation for onboarding documentation."""
 
 from typing import List, Dict, Set, Tuple
-from collections import defaultdict
+from collections import Counter, defaultdict
+from itertools import chain
 from .models import ModuleInfo, FunctionInfo
 
 
+# Function names treated as entry points (main, CLI commands)
+_ENTRY_POINT_NAMES = frozenset({'main', 'analyze', 'report', 'anonymize'})
+
+# Fixed parts of the system call flow diagram
+_FLOW_DIAGRAM_HEADER = (
+    "┌─────────────────────────────────────────────────────────────┐",
+    "│                    SYSTEM CALL FLOW                          │",
+    "└─────────────────────────────────────────────────────────────┘",
+    "",
+)
+_FLOW_DIAGRAM_FOOTER = "└─────────────────────────────────────────────────────────────┘"
+
+# The data flow diagram does not depend on the project
+_DATA_FLOW_DIAGRAM = (
+    "┌──────────────────────────────────────────────────────────┐",
+    "│                    DATA FLOW                              │",
+    "└──────────────────────────────────────────────────────────┘",
+    "",
+    "  Python Files",
+    "       │",
+    "       ├──> AST Parser (ast.parse)",
+    "       │         │",
+    "       │         └──> ModuleInfo",
+    "       │                  │",
+    "       ├──> Analyzer",
+    "       │         │",
+    "       │         ├──> Issue Detection",
+    "       │         ├──> Complexity Analysis (radon)",
+    "       │         └──> Pattern Matching",
+    "       │",
+    "       └──> AnalysisResult",
+    "                 │",
+    "                 ├──> Logseq Documentation",
+    "                 ├──> Trends Database (SQLite)",
+    "                 ├──> Auto-Fix Suggestions",
+    "                 └──> JSON Report",
+    "",
+)
+
+
 class CallGraphBuilder:
     """Builds call graphs showing function relationships."""
     
@@ -12,38 +53,48 @@ class CallGraphBuilder:
         self.modules = modules
         self.call_map: Dict[str, List[str]] = defaultdict(list)
         self.entry_points: Set[str] = set()
+        # Rendered call trees by (entry point, max depth)
+        self._call_trees: Dict[Tuple[str, int], List[str]] = {}
         self._build_graph()
     
     def _build_graph(self):
         """Build the complete call graph."""
         for module in self.modules:
-            # Add functions
-            for func in module.functions:
-                func_name = f"{module.name}.{func.name}"
-                self.call_map[func_name] = [
-                    call for call in func.calls if not call.startswith('_')
-                ]
-                
-                # Detect entry points (main, CLI commands)
-                if func.name == 'main' or func.name in ['analyze', 'report', 'anonymize']:
-                    self.entry_points.add(func_name)
+            # Functions and class methods alike
+            callables = chain(
+                ((f"{module.name}.{func.name}", func) for func in module.functions),
+                ((f"{module.name}.{cls.name}.{method.name}", method)
+                 for cls in module.classes for method in cls.methods),
+            )
+            for full_name, func in callables:
+                self.call_map[full_name] = [call for call in func.calls if call[:1] != '_']
             
-            # Add class methods
-            for cls in module.classes:
-                for method in cls.methods:
-                    method_name = f"{module.name}.{cls.name}.{method.name}"
-                    self.call_map[method_name] = [
-                        call for call in method.calls if not call.startswith('_')
-                    ]
+            # Detect entry points (main, CLI commands)
+            for func in module.functions:
+                if func.name in _ENTRY_POINT_NAMES:
+                    self.entry_points.add(f"{module.name}.{func.name}")
     
     def generate_call_tree(self, entry_point: str, max_depth: int = 4) -> List[str]:
-        """Generate ASCII call tree from an entry point."""
+        """Generate ASCII call tree from an entry point.
+        
+        Trees are rendered once per entry point and depth; later calls get a
+        copy of the stored lines.
+        """
+        key = (entry_point, max_depth)
+        if key in self._call_trees:
+            return list(self._call_trees[key])
+        
         lines = []
         visited = set()
+        call_map_get = self.call_map.get
         
-        def traverse(func_name: str, depth: int, prefix: str, is_last: bool):
+        # Depth-first with an explicit stack; children are pushed in reverse
+        # so they come off in call order
+        stack = [(entry_point, 0, "", True)]
+        while stack:
+            func_name, depth, prefix, is_last = stack.pop()
             if depth > max_depth or func_name in visited:
-                return
+                continue
             
             visited.add(func_name)
             
@@ -55,9 +106,9 @@ class CallGraphBuilder:
                 lines.append(f"{prefix}{branch} {func_name}")
             
             # Get callees
-            callees = self.call_map.get(func_name, [])
+            callees = call_map_get(func_name, ())
             if not callees:
-                return
+                continue
             
             # Update prefix for children
             if depth == 0:
@@ -65,26 +116,22 @@ class CallGraphBuilder:
             else:
                 child_prefix = prefix + ("    " if is_last else "│   ")
             
-            # Recurse into callees
-            for i, callee in enumerate(callees[:8]):  # Limit to 8 per level
-                is_last_child = (i == len(callees) - 1)
-                traverse(callee, depth + 1, child_prefix, is_last_child)
+            last = len(callees) - 1
+            shown = callees[:8]  # Limit to 8 per level
+            for i in range(len(shown) - 1, -1, -1):
+                stack.append((shown[i], depth + 1, child_prefix, i == last))
         
-        traverse(entry_point, 0, "", True)
-        return lines
+        self._call_trees[key] = lines
+        return list(lines)
     
     def generate_flow_diagram(self) -> List[str]:
         """Generate overall system flow diagram."""
-        lines = []
-        lines.append("┌─────────────────────────────────────────────────────────────┐")
-        lines.append("│                    SYSTEM CALL FLOW                          │")
-        lines.append("└─────────────────────────────────────────────────────────────┘")
-        lines.append("")
+        lines = list(_FLOW_DIAGRAM_HEADER)
         
         # Group by module
         module_funcs = defaultdict(list)
         for func_name in self.call_map.keys():
-            module = func_name.split('.')[0]
+            module = func_name.partition('.')[0]
             module_funcs[module].append(func_name)
         
         # Show main modules
@@ -95,52 +142,23 @@ class CallGraphBuilder:
             for i, func in enumerate(funcs):
                 is_last = (i == len(funcs) - 1)
                 symbol = "└──" if is_last else "├──"
-                func_short = func.split('.')[-1]
+                func_short = func.rpartition('.')[2]
                 lines.append(f"│   {symbol} {func_short}()")
             lines.append("│")
         
-        lines.append("└─────────────────────────────────────────────────────────────┘")
+        lines.append(_FLOW_DIAGRAM_FOOTER)
         return lines
     
     def find_hot_paths(self, top_n: int = 10) -> List[Tuple[str, int]]:
         """Find most-called functions (hotspots)."""
-        call_counts = defaultdict(int)
-        
-        for callees in self.call_map.values():
-            for callee in callees:
-                call_counts[callee] += 1
+        call_counts = Counter(chain.from_iterable(self.call_map.values()))
         
-        # Sort by call count
-        sorted_funcs = sorted(call_counts.items(), key=lambda x: x[1], reverse=True)
-        return sorted_funcs[:top_n]
+        # Highest call counts first, ties in order of first appearance
+        return call_counts.most_common(top_n)
     
     def generate_data_flow_diagram(self) -> List[str]:
         """Generate data flow diagram showing how data moves through the system."""
-        lines = []
-        lines.append("┌──────────────────────────────────────────────────────────┐")
-        lines.append("│                    DATA FLOW                              │")
-        lines.append("└──────────────────────────────────────────────────────────┘")
-        lines.append("")
-        lines.append("  Python Files")
-        lines.append("       │")
-        lines.append("       ├──> AST Parser (ast.parse)")
-        lines.append("       │         │")
-        lines.append("       │         └──> ModuleInfo")
-        lines.append("       │                  │")
-        lines.append("       ├──> Analyzer")
-        lines.append("       │         │")
-        lines.append("       │         ├──> Issue Detection")
-        lines.append("       │         ├──> Complexity Analysis (radon)")
-        lines.append("       │         └──> Pattern Matching")
-        lines.append("       │")
-        lines.append("       └──> AnalysisResult")
-        lines.append("                 │")
-        lines.append("                 ├──> Logseq Documentation")
-        lines.append("                 ├──> Trends Database (SQLite)")
-        lines.append("                 ├──> Auto-Fix Suggestions")
-        lines.append("                 └──> JSON Report")
-        lines.append("")
-        return lines
+        return list(_DATA_FLOW_DIAGRAM)
     
     def generate_module_dependencies(self) -> List[str]:
         """Generate module dependency diagram."""
@@ -149,12 +167,13 @@ class CallGraphBuilder:
         lines.append("")
         
         # Extract module-to-module dependencies
+        known_modules = frozenset(m.name for m in self.modules)
         module_deps = defaultdict(set)
         for func_name, callees in self.call_map.items():
-            source_module = func_name.split('.')[0]
+            source_module = func_name.partition('.')[0]
             for callee in callees:
-                target_module = callee.split('.')[0]
-                if target_module != source_module and target_module in [m.name for m in self.modules]:
+                target_module = callee.partition('.')[0]
+                if target_module != source_module and target_module in known_modules:
                     module_deps[source_module].add(target_module)
         
         # Show as list
@@ -38,19 +38,19 @@ jobs:
       run: |
         # Fail if critical issues found
         python -c "
-import json
-with open('.code-analyzer/analysis.json') as f:
-    data = json.load(f)
-    critical = data['metrics']['issues_by_severity'].get('critical', 0)
-    high = data['metrics']['issues_by_severity'].get('high', 0)
-    if critical > 0:
-        print(f'❌ Found {critical} critical issues')
-        exit(1)
-    if high > 5:
-        print(f'⚠️  Found {high} high severity issues (threshold: 5)')
-        exit(1)
-    print('✅ Quality checks passed')
-"
+        import json
+        with open('.code-analyzer/analysis.json') as f:
+            data = json.load(f)
+            critical = data['metrics']['issues_by_severity'].get('critical', 0)
+            high = data['metrics']['issues_by_severity'].get('high', 0)
+            if critical > 0:
+                print(f'❌ Found {critical} critical issues')
+                exit(1)
+            if high > 5:
+                print(f'⚠️  Found {high} high severity issues (threshold: 5)')
+                exit(1)
+            print('✅ Quality checks passed')
+        "
     
     - name: Upload Analysis Results
       uses: actions/upload-artifact@v3
@@ -70,20 +70,20 @@ with open('.code-analyzer/analysis.json') as f:
           
           const comment = `## 📊 Code Analysis Results
           
-**Quality Metrics:**
-- Total Issues: ${metrics.total_issues}
-- Critical: ${metrics.issues_by_severity.critical || 0}
-- High: ${metrics.issues_by_severity.high || 0}
-- Medium: ${metrics.issues_by_severity.medium || 0}
-- Low: ${metrics.issues_by_severity.low || 0}
-
-**Code Metrics:**
-- Average Complexity: ${metrics.average_complexity.toFixed(2)}
-- Max Complexity: ${metrics.max_complexity}
-- Total Files: ${metrics.total_files}
-- Total Lines: ${metrics.total_lines.toLocaleString()}
-
-[View Full Report](${{github.server_url}}/${{github.repository}}/actions/runs/${{github.run_id}})
+          **Quality Metrics:**
+          - Total Issues: ${metrics.total_issues}
+          - Critical: ${metrics.issues_by_severity.critical || 0}
+          - High: ${metrics.issues_by_severity.high || 0}
+          - Medium: ${metrics.issues_by_severity.medium || 0}
+          - Low: ${metrics.issues_by_severity.low || 0}
+
+          **Code Metrics:**
+          - Average Complexity: ${metrics.average_complexity.toFixed(2)}
+          - Max Complexity: ${metrics.max_complexity}
+          - Total Files: ${metrics.total_files}
+          - Total Lines: ${metrics.total_lines.toLocaleString()}
+
+          [View Full Report](${{github.server_url}}/${{github.repository}}/actions/runs/${{github.run_id}})
           `;
           
           github.rest.issues.createComment({
@@ -132,26 +132,33 @@ quality-gate:
   dependencies:
     - code-analysis
   script:
-    - python -c "
-import json
-with open('.code-analyzer/analysis.json') as f:
-    data = json.load(f)
-    critical = data['metrics']['issues_by_severity'].get('critical', 0)
-    if critical > 0:
-        print(f'Quality gate failed: {critical} critical issues')
-        exit(1)
-    print('Quality gate passed')
-"
+    - |
+      python -c "
+      import json
+      with open('.code-analyzer/analysis.json') as f:
+          data = json.load(f)
+          critical = data['metrics']['issues_by_severity'].get('critical', 0)
+          if critical > 0:
+              print(f'Quality gate failed: {critical} critical issues')
+              exit(1)
+          print('Quality gate passed')
+      "
 """
 
 
+# Templates encoded once; files are always written as UTF-8
+_GITHUB_ACTIONS_WORKFLOW_BYTES = GITHUB_ACTIONS_WORKFLOW.encode('utf-8')
+_PRE_COMMIT_CONFIG_BYTES = PRE_COMMIT_CONFIG.encode('utf-8')
+_GITLAB_CI_BYTES = GITLAB_CI.encode('utf-8')
+
+
 def generate_github_workflow(output_dir: Path):
     """Generate GitHub Actions workflow file."""
     workflow_dir = output_dir / ".github" / "workflows"
     workflow_dir.mkdir(parents=True, exist_ok=True)
     
     workflow_file = workflow_dir / "code-analysis.yml"
-    workflow_file.write_text(GITHUB_ACTIONS_WORKFLOW)
+    workflow_file.write_bytes(_GITHUB_ACTIONS_WORKFLOW_BYTES)
     
     return workflow_file
 
@@ -159,7 +166,7 @@ def generate_github_workflow(output_dir: Path):
 def generate_pre_commit_config(output_dir: Path):
     """Generate pre-commit configuration."""
     config_file = output_dir / ".pre-commit-config.yaml"
-    config_file.write_text(PRE_COMMIT_CONFIG)
+    config_file.write_bytes(_PRE_COMMIT_CONFIG_BYTES)
     
     return config_file
 
@@ -167,7 +174,7 @@ def generate_pre_commit_config(output_dir: Path):
 def generate_gitlab_ci(output_dir: Path):
     """Generate GitLab CI configuration."""
     ci_file = output_dir / ".gitlab-ci.yml"
-    ci_file.write_text(GITLAB_CI)
+    ci_file.write_bytes(_GITLAB_CI_BYTES)
     
     return ci_file
 
@@ -3,28 +3,34 @@
 import click
 import json
 import yaml
+from operator import methodcaller
 from pathlib import Path
 from rich.console import Console
 from rich.table import Table
-
-from .analyzer import CodeAnalyzer
-from .anonymizer import CodeAnonymizer
-from .logseq_integration import LogseqDocGenerator
-from .tickets_integration import TicketsManager
-from .models import IssueSeverity
-from .onboarding import OnboardingAnalyzer, format_onboarding_report
 try:
-    from .onboarding_formatter import format_enhanced_onboarding
-    HAS_ENHANCED = True
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+# LibYAML's C parser when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader
 except ImportError:
-    HAS_ENHANCED = False
-from .autofix import AutoFixGenerator
-from .vcs_analysis import VCSAnalyzer
-from .trends import TrendsDatabase, generate_trend_markdown
-from .cicd_templates import generate_all_cicd
+    from yaml import SafeLoader as _YamlLoader
+
+# Analysis modules are imported by the commands and options that use them,
+# so --help and light commands like report start quickly.
 
 console = Console()
 
+# Rich color for each issue severity
+_SEV_COLOR = {
+    "critical": "red",
+    "high": "orange1",
+    "medium": "yellow",
+    "low": "blue"
+}
+
 
 @click.group()
 @click.version_option(version="0.1.0")
@@ -65,22 +71,27 @@ def main():
               help="Generate CI/CD configuration files")
 @click.option("--intelligence", is_flag=True,
               help="Generate intelligence reports (trends, debt, performance, security, coverage)")
-def analyze(project_path, depth, logseq_graph, create_tickets, generate_docs, output, config, plugins, code_library, use_default_library, onboarding, auto_fix, vcs_analysis, track_trends, generate_cicd, intelligence):
+@click.option("--workers", type=int, default=None,
+              help="Processes used to analyze files and generate fixes (0 = one per CPU, default 1)")
+@click.option("--no-cache", is_flag=True,
+              help="Reanalyze every file instead of reusing results cached by earlier runs")
+def analyze(project_path, depth, logseq_graph, create_tickets, generate_docs, output, config, plugins, code_library, use_default_library, onboarding, auto_fix, vcs_analysis, track_trends, generate_cicd, intelligence, workers, no_cache):
     """Analyze a Python project."""
     console.print("[bold blue]🔍 Code Analyzer[/bold blue]")
     console.print(f"Project: {project_path}\n")
     
-    # Load configuration
-    cfg = {}
-    if config:
-        with open(config, 'r') as f:
-            cfg = yaml.safe_load(f) or {}
+    project_path_obj = Path(project_path)
+    project_name = project_path_obj.name
+    project_resolved = str(project_path_obj.resolve())
     
-    # Check for config file in project
-    config_path = Path(project_path) / ".code-analyzer.yaml"
-    if config_path.exists():
-        with open(config_path, 'r') as f:
-            cfg = yaml.safe_load(f) or {}
+    # Load configuration; a config file in the project takes precedence.
+    # Opening it directly checks for it without a separate stat.
+    try:
+        cfg = _load_config(project_path_obj / ".code-analyzer.yaml")
+    except FileNotFoundError:
+        cfg = None
+    if cfg is None:
+        cfg = _load_config(Path(config)) if config else {}
     
     # Apply config overrides
     if cfg:
@@ -91,6 +102,8 @@ def analyze(project_path, depth, logseq_graph, create_tickets, generate_docs, ou
             create_tickets = True
         if not generate_docs and cfg.get("documentation", {}).get("create_index"):
             generate_docs = True
+        if workers is None:
+            workers = cfg.get("analysis", {}).get("workers")
     
     # Get plugin and library paths from config
     if not plugins:
@@ -109,23 +122,33 @@ def analyze(project_path, depth, logseq_graph, create_tickets, generate_docs, ou
         library_path = Path(".code-analyzer") / "default_library.yaml"  # Marker for default
     
     # Initialize analyzer
+    from .analyzer import CodeAnalyzer
+    from .ast_cache import DEFAULT_CACHE_DIR
+    
     ignore_patterns = cfg.get("analysis", {}).get("ignore_patterns")
+    # Per-file results are cached across runs unless disabled by flag or config
+    use_cache = not no_cache and cfg.get("analysis", {}).get("cache", True)
     analyzer = CodeAnalyzer(
         project_path, 
         ignore_patterns=ignore_patterns,
         plugin_dir=plugin_dir,
-        code_library_path=library_path
+        code_library_path=library_path,
+        cache_dir=DEFAULT_CACHE_DIR if use_cache else None
     )
     
-    # Run analysis
+    # Run analysis; workers=0 means one process per CPU
+    if workers is None:
+        workers = 1
     with console.status("[bold green]Analyzing code..."):
-        result = analyzer.analyze(depth=depth)
+        result = analyzer.analyze(depth=depth, workers=workers or None)
     
     # VCS Analysis
     vcs_insights = None
     if vcs_analysis:
         console.print("\n📊 Analyzing VCS history...")
-        vcs_analyzer = VCSAnalyzer(Path(project_path))
+        from .vcs_analysis import VCSAnalyzer
+        
+        vcs_analyzer = VCSAnalyzer(project_path_obj)
         vcs_insights = vcs_analyzer.analyze(since_days=90)
         if vcs_insights:
             console.print(f"   ✅ Analyzed {vcs_insights.total_commits} commits")
@@ -135,20 +158,27 @@ def analyze(project_path, depth, logseq_graph, create_tickets, generate_docs, ou
     _display_summary(result)
     
     # Save results
-    output_dir = Path(project_path) / output
+    output_dir = project_path_obj / output
     output_dir.mkdir(parents=True, exist_ok=True)
     
     # Generate onboarding FIRST (before Logseq docs need it)
     onboarding_file = None
     if onboarding:
-        onboarding_analyzer = OnboardingAnalyzer(Path(project_path))
+        from .onboarding import OnboardingAnalyzer, format_onboarding_report
+        try:
+            from .onboarding_formatter import format_enhanced_onboarding
+            has_enhanced = True
+        except ImportError:
+            has_enhanced = False
+        
+        onboarding_analyzer = OnboardingAnalyzer(project_path_obj)
         insights = onboarding_analyzer.generate_insights(result.modules)
         
         # Use enhanced formatter if available, otherwise use basic
-        if HAS_ENHANCED:
+        if has_enhanced:
             onboarding_report = format_enhanced_onboarding(
                 insights, 
-                project_root=str(Path(project_path).resolve()),
+                project_root=project_resolved,
                 modules=result.modules,
                 issues=result.issues
             )
@@ -163,34 +193,37 @@ def analyze(project_path, depth, logseq_graph, create_tickets, generate_docs, ou
     
     # Generate Logseq documentation BEFORE saving new analysis (so it can compare with previous)
     if generate_docs and logseq_graph:
-        project_name = Path(project_path).name
+        from .logseq_integration import LogseqDocGenerator
+        
         doc_gen = LogseqDocGenerator(logseq_graph)
         doc_gen.generate_documentation(result, project_name, onboarding_path=onboarding_file)
     
     # Track trends
     if track_trends:
+        from .trends import TrendsDatabase, generate_trend_markdown
+        
         trends_db = TrendsDatabase(output_dir / "trends.db")
         branch = vcs_insights.branch_name if vcs_insights else ""
         trends_db.store_analysis(result, branch=branch)
         console.print("\n📈 Stored analysis in trends database")
         
         # Generate trend report
-        trends = trends_db.get_trends(str(Path(project_path).resolve()), days=30)
+        trends = trends_db.get_trends(project_resolved, days=30)
         if len(trends) >= 2:
-            trend_report = generate_trend_markdown(trends, Path(project_path).name)
+            trend_report = generate_trend_markdown(trends, project_name)
             trend_file = output_dir / "TRENDS.md"
             trend_file.write_text(trend_report)
             console.print(f"   ✅ Generated trend report: {trend_file}")
     
     # Save JSON report AFTER documentation (so resolved issue tracking works)
     json_file = output_dir / "analysis.json"
-    with open(json_file, 'w') as f:
-        json.dump(_result_to_dict(result), f, indent=2, default=str)
+    _write_result_json(json_file, result)
     console.print(f"\n💾 Saved analysis to: {json_file}")
     
     # Create tickets
     if create_tickets:
-        project_name = Path(project_path).name
+        from .tickets_integration import TicketsManager
+        
         tickets_mgr = TicketsManager(project_path)
         tickets_mgr.create_epic_and_tickets(result, project_name)
     
@@ -202,8 +235,10 @@ def analyze(project_path, depth, logseq_graph, create_tickets, generate_docs, ou
     # Generate auto-fixes
     if auto_fix:
         console.print("\n🔧 Generating automatic fixes...")
+        from .autofix import AutoFixGenerator
+        
         fixer = AutoFixGenerator()
-        fixes = fixer.generate_fixes(result.issues, Path(project_path))
+        fixes = fixer.generate_fixes(result.issues, project_path_obj, workers=workers or None)
         
         if fixes:
             console.print(f"   🔍 Found {len(fixes)} auto-fixable issues\n")
@@ -236,7 +271,9 @@ def analyze(project_path, depth, logseq_graph, create_tickets, generate_docs, ou
     # Generate CI/CD configs
     if generate_cicd:
         console.print(f"\n⚙️  Generating {generate_cicd.upper()} CI/CD configurations...")
-        cicd_files = generate_all_cicd(Path(project_path), generate_cicd)
+        from .cicd_templates import generate_all_cicd
+        
+        cicd_files = generate_all_cicd(project_path_obj, generate_cicd)
         for file in cicd_files:
             console.print(f"   ✅ Created: {file}")
     
@@ -248,6 +285,7 @@ def analyze(project_path, depth, logseq_graph, create_tickets, generate_docs, ou
         from .performance import format_performance_report
         from .security import format_security_report
         from .coverage_analysis import format_coverage_report
+        from .trends import TrendsDatabase
         
         intel_file = output_dir / "INTELLIGENCE.md"
         intel_sections = []
@@ -255,7 +293,7 @@ def analyze(project_path, depth, logseq_graph, create_tickets, generate_docs, ou
         # Quality trends (if trends available)
         if track_trends or (output_dir / "trends.db").exists():
             trends_db = TrendsDatabase(output_dir / "trends.db")
-            trends_report = format_quality_trends(str(Path(project_path).resolve()), trends_db, days=90)
+            trends_report = format_quality_trends(project_resolved, trends_db, days=90)
             if trends_report:
                 intel_sections.append(trends_report)
                 console.print("   ✅ Quality trends analysis")
@@ -273,14 +311,14 @@ def analyze(project_path, depth, logseq_graph, create_tickets, generate_docs, ou
             console.print("   ✅ Performance hotspots")
         
         # Security & dependencies
-        security_report = format_security_report(Path(project_path))
+        security_report = format_security_report(project_path_obj)
         if security_report:
             intel_sections.append(security_report)
             console.print("   ✅ Security & dependency scan")
         
         # Test coverage
         module_complexity = {m.name: int(sum(f.complexity for f in m.functions) / max(len(m.functions), 1)) for m in result.modules}
-        coverage_report = format_coverage_report(Path(project_path), module_complexity)
+        coverage_report = format_coverage_report(project_path_obj, module_complexity)
         if coverage_report:
             intel_sections.append(coverage_report)
             console.print("   ✅ Test coverage analysis")
@@ -298,16 +336,20 @@ def analyze(project_path, depth, logseq_graph, create_tickets, generate_docs, ou
 @click.argument("project_path", type=click.Path(exists=True))
 @click.option("--output", type=click.Path(), required=True,
               help="Output directory for anonymized code")
-def anonymize(project_path, output):
+@click.option("--workers", type=int, default=1,
+              help="Processes used to anonymize files (0 = one per CPU, default 1)")
+def anonymize(project_path, output, workers):
     """Anonymize code for external analysis."""
     console.print("[bold blue]🔒 Code Anonymizer[/bold blue]\n")
     
+    from .anonymizer import CodeAnonymizer
+    
     anonymizer = CodeAnonymizer()
     
     with console.status("[bold green]Anonymizing code..."):
         source_path = Path(project_path)
         output_path = Path(output)
-        anonymizer.anonymize_project(source_path, output_path)
+        anonymizer.anonymize_project(source_path, output_path, workers=workers or None)
     
     # Create structure summary
     summary = anonymizer.create_structure_summary(source_path)
@@ -326,8 +368,7 @@ def anonymize(project_path, output):
 @click.option("--type", "issue_type", help="Filter by issue type")
 def report(analysis_file, severity, issue_type):
     """Generate report from analysis results."""
-    with open(analysis_file, 'r') as f:
-        data = json.load(f)
+    data = _read_json(Path(analysis_file))
     
     console.print("[bold blue]📊 Analysis Report[/bold blue]\n")
     
@@ -341,28 +382,32 @@ def report(analysis_file, severity, issue_type):
     console.print(f"Average Complexity: {metrics['average_complexity']:.2f}")
     console.print()
     
-    # Display issues table
-    issues = data["issues"]
-    
-    if severity:
-        issues = [i for i in issues if i["severity"] == severity]
-    if issue_type:
-        issues = [i for i in issues if i["type"] == issue_type]
+    # Display issues table; filters are applied in one pass that keeps
+    # only the rows shown
+    if severity or issue_type:
+        issues = []
+        match_count = 0
+        for issue in data["issues"]:
+            if severity and issue["severity"] != severity:
+                continue
+            if issue_type and issue["type"] != issue_type:
+                continue
+            if match_count < 50:
+                issues.append(issue)
+            match_count += 1
+    else:
+        issues = data["issues"][:50]
+        match_count = len(data["issues"])
     
     if issues:
-        table = Table(title=f"Issues ({len(issues)})")
+        table = Table(title=f"Issues ({match_count})")
         table.add_column("Severity", style="cyan")
         table.add_column("Type", style="magenta")
         table.add_column("Title", style="white")
         table.add_column("Location", style="green")
         
-        for issue in issues[:50]:  # Show first 50
-            sev_color = {
-                "critical": "red",
-                "high": "orange1",
-                "medium": "yellow",
-                "low": "blue"
-            }.get(issue["severity"], "white")
+        for issue in issues:  # Show first 50
+            sev_color = _SEV_COLOR.get(issue["severity"], "white")
             
             table.add_row(
                 f"[{sev_color}]{issue['severity'].upper()}[/{sev_color}]",
@@ -373,12 +418,38 @@ def report(analysis_file, severity, issue_type):
         
         console.print(table)
         
-        if len(data["issues"]) > 50:
-            console.print(f"\n... and {len(data['issues']) - 50} more issues")
+        if match_count > 50:
+            console.print(f"\n... and {match_count - 50} more issues")
     else:
         console.print("[yellow]No issues found matching criteria[/yellow]")
 
 
+@main.command("quality-gate")
+@click.argument("analysis_file", type=click.Path(exists=True))
+@click.option("--critical-max", type=int, default=0, show_default=True,
+              help="Most critical issues allowed")
+@click.option("--high-max", type=int, default=None,
+              help="Most high severity issues allowed (default: no limit)")
+def quality_gate(analysis_file, critical_max, high_max):
+    """Exit with status 1 when an analysis has too many severe issues.
+    
+    Examples:
+      code-analyzer quality-gate .code-analyzer/analysis.json
+      code-analyzer quality-gate .code-analyzer/analysis.json --high-max 5
+    """
+    issues_by_severity = _read_json(Path(analysis_file))["metrics"]["issues_by_severity"]
+    critical = issues_by_severity.get("critical", 0)
+    high = issues_by_severity.get("high", 0)
+    
+    if critical > critical_max:
+        console.print(f"❌ Found {critical} critical issues (threshold: {critical_max})")
+        raise SystemExit(1)
+    if high_max is not None and high > high_max:
+        console.print(f"⚠️  Found {high} high severity issues (threshold: {high_max})")
+        raise SystemExit(1)
+    console.print("✅ Quality checks passed")
+
+
 def _display_summary(result):
     """Display analysis summary."""
     console.print("\n[bold]Analysis Summary[/bold]")
@@ -405,54 +476,115 @@ def _display_summary(result):
         for severity in ["critical", "high", "medium", "low"]:
             count = result.metrics.issues_by_severity.get(severity, 0)
             if count > 0:
-                color = {
-                    "critical": "red",
-                    "high": "orange1",
-                    "medium": "yellow",
-                    "low": "blue"
-                }[severity]
+                color = _SEV_COLOR[severity]
                 console.print(f"  [{color}]●[/{color}] {severity.upper()}: {count}")
 
 
-def _result_to_dict(result):
-    """Convert AnalysisResult to dictionary."""
+def _json_bytes(data) -> bytes:
+    """Serialize data as indented JSON, using orjson when it is installed."""
+    if HAS_ORJSON:
+        return orjson.dumps(
+            data, default=str,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(data, indent=2, default=str).encode()
+
+
+def _write_result_json(path: Path, result):
+    """Write the analysis report as indented JSON, one section at a time.
+    
+    List sections are serialized an item at a time, so the report is never
+    held in memory as a whole, whether as dicts or as JSON text.
+    """
+    with open(path, 'wb') as f:
+        f.write(b"{")
+        for index, (key, value, streamed) in enumerate(_result_sections(result)):
+            f.write(b",\n  " if index else b"\n  ")
+            f.write(_json_bytes(key) + b": ")
+            if not streamed:
+                f.write(_json_bytes(value).replace(b"\n", b"\n  "))
+                continue
+            
+            empty = True
+            for item in value:
+                f.write(b"[\n    " if empty else b",\n    ")
+                f.write(_json_bytes(item).replace(b"\n", b"\n    "))
+                empty = False
+            f.write(b"[]" if empty else b"\n  ]")
+        f.write(b"\n}")
+
+
+def _read_json(path: Path):
+    """Load a JSON file, using orjson when it is installed."""
+    if HAS_ORJSON:
+        return orjson.loads(path.read_bytes())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def _load_config(path: Path) -> dict:
+    """Load a YAML config file.
+    
+    Args:
+        path: Config file to load
+        
+    Returns:
+        The parsed configuration, empty if the file is empty
+    """
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=_YamlLoader) or {}
+
+
+def _result_sections(result):
+    """Yield (key, value, streamed) triples of the analysis report in output order.
+    
+    Sections holding one entry per issue or section are lazy maps marked as
+    streamed, so each entry is built only when it is written. Other values
+    are written whole.
+    """
+    yield "project_path", result.project_path, False
+    yield "analysis_date", result.analysis_date.isoformat(), False
+    yield "metrics", {
+        "total_files": result.metrics.total_files,
+        "total_lines": result.metrics.total_lines,
+        "total_classes": result.metrics.total_classes,
+        "total_functions": result.metrics.total_functions,
+        "total_issues": result.metrics.total_issues,
+        "issues_by_severity": result.metrics.issues_by_severity,
+        "issues_by_type": result.metrics.issues_by_type,
+        "average_complexity": result.metrics.average_complexity,
+        "max_complexity": result.metrics.max_complexity,
+    }, False
+    yield "issues", map(_issue_to_dict, result.issues), True
+    yield "critical_sections", map(_cs_to_dict, result.critical_sections), True
+    yield "entry_points", result.entry_points, False
+    yield "dependency_graph", result.dependency_graph, False
+    yield "important_sections", map(_isec_to_dict, result.important_sections), True
+
+
+# Report entry for one issue
+_issue_to_dict = methodcaller("to_dict")
+
+
+def _cs_to_dict(cs) -> dict:
+    """Report entry for one critical section."""
+    return {
+        "name": cs.name,
+        "location": str(cs.location),
+        "reason": cs.reason,
+        "risk_level": cs.risk_level.value,
+    }
+
+
+def _isec_to_dict(s) -> dict:
+    """Report entry for one important section."""
     return {
-        "project_path": result.project_path,
-        "analysis_date": result.analysis_date.isoformat(),
-        "metrics": {
-            "total_files": result.metrics.total_files,
-            "total_lines": result.metrics.total_lines,
-            "total_classes": result.metrics.total_classes,
-            "total_functions": result.metrics.total_functions,
-            "total_issues": result.metrics.total_issues,
-            "issues_by_severity": result.metrics.issues_by_severity,
-            "issues_by_type": result.metrics.issues_by_type,
-            "average_complexity": result.metrics.average_complexity,
-            "max_complexity": result.metrics.max_complexity,
-        },
-        "issues": [issue.to_dict() for issue in result.issues],
-        "critical_sections": [
-            {
-                "name": cs.name,
-                "location": str(cs.location),
-                "reason": cs.reason,
-                "risk_level": cs.risk_level.value,
-            }
-            for cs in result.critical_sections
-        ],
-        "entry_points": result.entry_points,
-        "dependency_graph": result.dependency_graph,
-        "important_sections": [
-            {
-                "name": s.name,
-                "location": str(s.location),
-                "category": s.category,
-                "importance": s.importance,
-                "description": s.description,
-                "pattern_type": getattr(s, 'pattern_type', None),
-            }
-            for s in result.important_sections
-        ],
+        "name": s.name,
+        "location": str(s.location),
+        "category": s.category,
+        "importance": s.importance,
+        "description": s.description,
+        "pattern_type": getattr(s, 'pattern_type', None),
     }
 
 
@@ -498,6 +630,7 @@ def search(project_path, query, limit):
       code-analyzer search . "functions that handle HTTP requests"
       code-analyzer search /path/to/project "database connection classes"
     """
+    from .analyzer import CodeAnalyzer
     from .nl_search import NaturalLanguageSearch, format_search_results
     
     console.print(f"[bold blue]🔍 Searching:[/bold blue] {query}\n")
@@ -535,6 +668,7 @@ def llm(project_path, provider, question, explain_module, generate_docs):
       code-analyzer llm . --explain-module api_handler
       code-analyzer llm . --generate-docs
     """
+    from .analyzer import CodeAnalyzer
     from .llm_analyzer import LLMAnalyzer, format_llm_response
     
     try:
@@ -159,6 +159,38 @@ class PatternMatcher:
         """
         self.library = library
         self.similarity_threshold = similarity_threshold
+        # Per-example matchers keyed by example code, built on first use
+        self._example_profiles: Dict[str, tuple] = {}
+    
+    @staticmethod
+    def _node_types(code: str) -> Optional[List[str]]:
+        """Return the AST node type names of code, or None if it doesn't parse."""
+        try:
+            return [type(node).__name__ for node in ast.walk(ast.parse(code))]
+        except Exception:
+            return None
+    
+    def _example_profile(self, code: str) -> tuple:
+        """
+        Get the precomputed comparison data for a library example.
+        
+        SequenceMatcher caches its analysis of the second sequence, so each
+        example gets one matcher for its text and one for its node types that
+        are reused against every snippet, and the example is parsed only once.
+        
+        Returns:
+            Tuple of (text matcher, node matcher or None, node type counts or None)
+        """
+        profile = self._example_profiles.get(code)
+        if profile is None:
+            nodes = self._node_types(code)
+            profile = (
+                difflib.SequenceMatcher(None, b=code),
+                difflib.SequenceMatcher(None, b=nodes) if nodes is not None else None,
+                Counter(nodes) if nodes is not None else None,
+            )
+            self._example_profiles[code] = profile
+        return profile
     
     def _calculate_similarity(self, code1: str, code2: str) -> float:
         """
@@ -172,33 +204,32 @@ class PatternMatcher:
         Returns:
             Similarity score from 0.0 to 1.0
         """
-        # Text similarity
-        text_sim = difflib.SequenceMatcher(None, code1, code2).ratio()
+        return self._similarity_to_example(code1, self._node_types(code1), code2)
+    
+    def _similarity_to_example(self, code: str, nodes: Optional[List[str]],
+                               example_code: str) -> float:
+        """Calculate similarity of code (with pre-extracted node types) to an example."""
+        text_matcher, node_matcher, example_counts = self._example_profile(example_code)
         
-        try:
-            # AST structure similarity
-            tree1 = ast.parse(code1)
-            tree2 = ast.parse(code2)
-            
-            nodes1 = [type(node).__name__ for node in ast.walk(tree1)]
-            nodes2 = [type(node).__name__ for node in ast.walk(tree2)]
-            
-            # Compare node type sequences
-            ast_sim = difflib.SequenceMatcher(None, nodes1, nodes2).ratio()
-            
-            # Token similarity (node type frequencies)
-            counter1 = Counter(nodes1)
-            counter2 = Counter(nodes2)
-            
-            all_nodes = set(counter1.keys()) | set(counter2.keys())
-            token_sim = sum(min(counter1[n], counter2[n]) for n in all_nodes) / max(len(nodes1), len(nodes2))
-            
-            # Weighted average
-            return 0.3 * text_sim + 0.4 * ast_sim + 0.3 * token_sim
+        # Text similarity
+        text_matcher.set_seq1(code)
+        text_sim = text_matcher.ratio()
         
-        except:
+        if nodes is None or node_matcher is None:
             # Fall back to text similarity if AST parsing fails
             return text_sim
+        
+        # Compare node type sequences
+        node_matcher.set_seq1(nodes)
+        ast_sim = node_matcher.ratio()
+        
+        # Token similarity (node type frequencies)
+        counts = Counter(nodes)
+        overlap = sum(min(count, example_counts[n]) for n, count in counts.items())
+        token_sim = overlap / max(len(nodes), len(node_matcher.b))
+        
+        # Weighted average
+        return 0.3 * text_sim + 0.4 * ast_sim + 0.3 * token_sim
     
     def _extract_code_snippets(self, module: ModuleInfo) -> List[tuple]:
         """
@@ -252,8 +283,9 @@ class PatternMatcher:
         snippets = self._extract_code_snippets(module)
         
         for code, location, context in snippets:
+            nodes = self._node_types(code)
             for example in self.library.examples:
-                similarity = self._calculate_similarity(code, example.code)
+                similarity = self._similarity_to_example(code, nodes, example.code)
                 
                 if similarity >= self.similarity_threshold:
                     matches.append(PatternMatch(
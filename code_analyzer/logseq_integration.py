@@ -7,6 +7,12 @@ from pathlib import Path
 from datetime import datetime
 from typing import List, Set, Dict
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # Add logseq-python to path
 sys.path.insert(0, "/Volumes/Projects/logseq-python")
 
@@ -569,12 +575,15 @@ Code sections that need updates, refactoring, or enhancements.
             return set()
         
         try:
-            with open(analysis_file, 'r') as f:
-                data = json.load(f)
-                issues = data.get('issues', [])
-                fingerprints = {issue.get('fingerprint') for issue in issues if 'fingerprint' in issue}
-                print(f"   📊 Loaded {len(fingerprints)} previous issue fingerprints")
-                return fingerprints
+            if HAS_ORJSON:
+                data = orjson.loads(analysis_file.read_bytes())
+            else:
+                with open(analysis_file, 'r') as f:
+                    data = json.load(f)
+            issues = data.get('issues', [])
+            fingerprints = {issue.get('fingerprint') for issue in issues if 'fingerprint' in issue}
+            print(f"   📊 Loaded {len(fingerprints)} previous issue fingerprints")
+            return fingerprints
         except Exception as e:
             print(f"   ⚠️  Could not load previous analysis: {e}")
             return set()
@@ -32,6 +32,10 @@ setup(
         "tqdm>=4.65.0",
     ],
     extras_require={
+        "fast": [
+            "orjson>=3.9.0",
+            "xxhash>=3.0.0",
+        ],
         "full": [
             "bandit>=1.7.0",
             "pylint>=2.17.0",
@@ -23,6 +23,23 @@ class TestCodeAnalyzerInit:
         assert len(analyzer.modules) == 0
         assert len(analyzer.issues) == 0
     
+    def test_shared_analyzer_rebinds_project(self, tmp_path):
+        """Test that the shared analyzer is reused and reset per project."""
+        first_project = tmp_path / "first"
+        second_project = tmp_path / "second"
+        for project in (first_project, second_project):
+            project.mkdir()
+            (project / "main.py").write_text("def main():\n    pass\n")
+        
+        analyzer = CodeAnalyzer.shared()
+        assert CodeAnalyzer.shared() is analyzer
+        
+        first = analyzer.set_project(str(first_project)).analyze(depth="shallow")
+        second = analyzer.set_project(str(second_project)).analyze(depth="shallow")
+        
+        assert second.project_path == str(second_project.resolve())
+        assert len(first.modules) == len(second.modules) == 1
+    
     def test_default_ignore_patterns(self, tmp_path):
         """Test default ignore patterns are set."""
         analyzer = CodeAnalyzer(str(tmp_path))
@@ -71,6 +88,27 @@ class TestIgnorePatterns:
         
         source_path = tmp_path / "src" / "main.py"
         assert not analyzer._should_ignore(source_path)
+    
+    def test_should_ignore_glob_component(self, tmp_path):
+        """Test that wildcard patterns match a whole path component."""
+        analyzer = CodeAnalyzer(str(tmp_path))
+        
+        assert analyzer._should_ignore(tmp_path / "pkg.egg-info" / "setup.py")
+        assert not analyzer._should_ignore(tmp_path / "src" / "egg_info.py")
+        assert not analyzer._should_ignore(tmp_path / "environment" / "main.py")
+    
+    def test_should_ignore_windows_separators(self, monkeypatch):
+        """Test that patterns match paths using backslash separators."""
+        from code_analyzer.analyzer import _compile_ignore_patterns
+        
+        monkeypatch.setattr("os.sep", "\\")
+        monkeypatch.setattr("os.altsep", "/")
+        ignore_re = _compile_ignore_patterns(["venv/*", "*/build/lib/*"])
+        
+        assert ignore_re.search("C:\\proj\\venv\\lib\\site.py")
+        assert ignore_re.search("C:\\proj\\build\\lib\\mod.py")
+        assert ignore_re.search("C:/proj/venv/site.py")
+        assert not ignore_re.search("C:\\proj\\src\\venv_tools.py")
 
 
 class TestFindPythonFiles:
@@ -116,6 +154,24 @@ class TestFindPythonFiles:
         
         assert len(files) == 2
     
+    def test_parallel_walk_matches_sequential(self, tmp_path):
+        """Test that walking top-level directories in threads keeps the order."""
+        (tmp_path / "setup.py").write_text("pass")
+        for name in ("alpha", "beta", "gamma"):
+            package = tmp_path / name / "sub"
+            package.mkdir(parents=True)
+            (package.parent / "__init__.py").write_text("pass")
+            (package / "mod.py").write_text("pass")
+        (tmp_path / "build").mkdir()
+        (tmp_path / "build" / "generated.py").write_text("pass")
+        
+        analyzer = CodeAnalyzer(str(tmp_path))
+        sequential = analyzer._walk(str(tmp_path), {'.py'})
+        parallel = analyzer._walk(str(tmp_path), {'.py'}, parallel=True)
+        
+        assert parallel == sequential
+        assert len(parallel) == 7
+    
     def test_ignore_venv_files(self, tmp_path):
         """Test that venv files are not found."""
         # Create source file
@@ -224,6 +280,50 @@ def broken(
         assert len(module.functions) == 0
         assert len(module.classes) == 0
     
+    def test_analyze_blank_file(self, tmp_path):
+        """Test that blank files produce an empty module without parsing."""
+        test_file = tmp_path / "__init__.py"
+        test_file.write_text("")
+        
+        analyzer = CodeAnalyzer(str(tmp_path))
+        module = analyzer._analyze_file(test_file)
+        
+        assert module is not None
+        assert module.lines_of_code == 0
+        assert module.docstring is None
+
+    def test_lines_of_code_count(self, tmp_path):
+        """Test that a missing trailing newline still counts the last line."""
+        with_newline = tmp_path / "a.py"
+        with_newline.write_text("x = 1\ny = 2\n")
+        without_newline = tmp_path / "b.py"
+        without_newline.write_text("x = 1\ny = 2")
+
+        analyzer = CodeAnalyzer(str(tmp_path))
+
+        assert analyzer._analyze_file(with_newline).lines_of_code == 2
+        assert analyzer._analyze_file(without_newline).lines_of_code == 2
+
+    def test_nested_generator_not_outer_generator(self, tmp_path):
+        """Test that a yield in a nested function doesn't mark the outer one."""
+        test_file = tmp_path / "gen.py"
+        test_file.write_text(
+            "def outer():\n"
+            "    def inner():\n"
+            "        yield 1\n"
+            "    return inner\n"
+            "\n"
+            "def producer():\n"
+            "    helper = lambda: 0\n"
+            "    yield helper()\n"
+        )
+        
+        analyzer = CodeAnalyzer(str(tmp_path))
+        module = analyzer._analyze_file(test_file)
+        
+        generators = {func.name: func.is_generator for func in module.functions}
+        assert generators == {"outer": False, "producer": True}
+    
     def test_analyze_file_with_docstring(self, tmp_path):
         """Test that module docstrings are captured."""
         test_file = tmp_path / "documented.py"
@@ -351,6 +451,218 @@ def function2():
         assert result.metrics.total_files == 1
         assert result.metrics.total_classes == 1
         assert result.metrics.total_functions >= 2  # At least the top-level functions
+    
+    def test_analyze_with_workers(self, tmp_path):
+        """Test that parallel analysis matches serial analysis."""
+        for i in range(4):
+            (tmp_path / f"module{i}.py").write_text(f"def func{i}():\n    return {i}\n")
+        
+        serial = CodeAnalyzer(str(tmp_path)).analyze(depth="shallow")
+        parallel = CodeAnalyzer(str(tmp_path)).analyze(depth="shallow", workers=2)
+        
+        assert sorted(m.name for m in parallel.modules) == sorted(m.name for m in serial.modules)
+        assert parallel.metrics.total_functions == serial.metrics.total_functions == 4
+
+
+class TestAnalysisCache:
+    """Tests for the per-file result cache."""
+    
+    def test_cached_results_reused(self, tmp_path):
+        """Test that unchanged files are served from the cache."""
+        project = tmp_path / "project"
+        project.mkdir()
+        (project / "main.py").write_text("def main():\n    pass\n")
+        cache_dir = tmp_path / "cache"
+        
+        first = CodeAnalyzer(str(project), cache_dir=cache_dir).analyze(depth="shallow")
+        assert (cache_dir / "ast_cache.sqlite3").exists()
+        
+        second = CodeAnalyzer(str(project), cache_dir=cache_dir).analyze(depth="shallow")
+        assert [m.name for m in second.modules] == [m.name for m in first.modules]
+        assert second.modules[0].functions[0].name == "main"
+    
+    def test_unchanged_file_not_read(self, tmp_path, monkeypatch):
+        """Test that files with matching mtime and size skip reading and hashing."""
+        project = tmp_path / "project"
+        project.mkdir()
+        (project / "main.py").write_text("def main():\n    pass\n")
+        cache_dir = tmp_path / "cache"
+        
+        CodeAnalyzer(str(project), cache_dir=cache_dir).analyze(depth="shallow")
+        
+        def fail_read(file_path):
+            raise AssertionError(f"unexpected read of {file_path}")
+        
+        monkeypatch.setattr("code_analyzer.analyzer._read_source", fail_read)
+        result = CodeAnalyzer(str(project), cache_dir=cache_dir).analyze(depth="shallow")
+        
+        assert result.modules[0].functions[0].name == "main"
+    
+    @pytest.mark.parametrize("count", [1, 3])
+    def test_missed_file_read_once(self, tmp_path, monkeypatch, count):
+        """Test that a cache miss analyzes the bytes read for hashing."""
+        from code_analyzer import analyzer as analyzer_module
+        
+        project = tmp_path / "project"
+        project.mkdir()
+        for i in range(count):
+            (project / f"mod_{i}.py").write_text(f"def func_{i}():\n    pass\n")
+        reads = []
+        read_source = analyzer_module._read_source
+        
+        def counting_read(file_path):
+            reads.append(Path(file_path).name)
+            return read_source(file_path)
+        
+        monkeypatch.setattr(analyzer_module, "_read_source", counting_read)
+        result = CodeAnalyzer(str(project), cache_dir=tmp_path / "cache").analyze(depth="shallow")
+        
+        assert sorted(reads) == [f"mod_{i}.py" for i in range(count)]
+        assert len(result.modules) == count
+    
+    def test_changed_file_reanalyzed(self, tmp_path):
+        """Test that editing a file invalidates its cache entry."""
+        project = tmp_path / "project"
+        project.mkdir()
+        source = project / "main.py"
+        source.write_text("def main():\n    pass\n")
+        cache_dir = tmp_path / "cache"
+        
+        CodeAnalyzer(str(project), cache_dir=cache_dir).analyze(depth="shallow")
+        source.write_text("def main():\n    pass\n\ndef helper():\n    pass\n")
+        result = CodeAnalyzer(str(project), cache_dir=cache_dir).analyze(depth="shallow")
+        
+        assert len(result.modules[0].functions) == 2
+    
+    def test_deleted_file_pruned(self, tmp_path):
+        """Test that entries for removed files and old contents are dropped."""
+        import sqlite3
+        
+        project = tmp_path / "project"
+        project.mkdir()
+        source = project / "main.py"
+        source.write_text("def main():\n    pass\n")
+        (project / "old.py").write_text("def old():\n    pass\n")
+        cache_dir = tmp_path / "cache"
+        
+        CodeAnalyzer(str(project), cache_dir=cache_dir).analyze(depth="shallow")
+        (project / "old.py").unlink()
+        source.write_text("def main():\n    return 1\n")
+        CodeAnalyzer(str(project), cache_dir=cache_dir).analyze(depth="shallow")
+        
+        conn = sqlite3.connect(str(cache_dir / "ast_cache.sqlite3"))
+        paths = [row[0] for row in conn.execute("SELECT path FROM modules")]
+        conn.close()
+        assert paths == [str(source.resolve())]
+    
+    def test_other_schema_reanalyzed(self, tmp_path, monkeypatch):
+        """Test that entries written under another cache schema are replaced."""
+        import sqlite3
+        from code_analyzer import ast_cache
+        
+        project = tmp_path / "project"
+        project.mkdir()
+        (project / "main.py").write_text("def main():\n    pass\n")
+        cache_dir = tmp_path / "cache"
+        
+        with monkeypatch.context() as patch:
+            patch.setattr(ast_cache, "_CACHE_VERSION", "old")
+            CodeAnalyzer(str(project), cache_dir=cache_dir).analyze(depth="shallow")
+        CodeAnalyzer(str(project), cache_dir=cache_dir).analyze(depth="shallow")
+        
+        conn = sqlite3.connect(str(cache_dir / "ast_cache.sqlite3"))
+        versions = [row[0] for row in conn.execute("SELECT version FROM modules")]
+        conn.close()
+        assert versions == [ast_cache._CACHE_VERSION]
+    
+    def test_subdirectory_not_served_parent_entries(self, tmp_path):
+        """Test that analyzing a subdirectory names modules relative to it."""
+        project = tmp_path / "project"
+        package = project / "pkg"
+        package.mkdir(parents=True)
+        (package / "mod.py").write_text("def run():\n    pass\n")
+        cache_dir = tmp_path / "cache"
+        
+        parent = CodeAnalyzer(str(project), cache_dir=cache_dir).analyze(depth="shallow")
+        child = CodeAnalyzer(str(package), cache_dir=cache_dir).analyze(depth="shallow")
+        again = CodeAnalyzer(str(project), cache_dir=cache_dir).analyze(depth="shallow")
+        
+        assert [(m.name, Path(m.file_path)) for m in parent.modules] == [("pkg.mod", Path("pkg/mod.py"))]
+        assert [(m.name, Path(m.file_path)) for m in child.modules] == [("mod", Path("mod.py"))]
+        assert [m.name for m in again.modules] == ["pkg.mod"]
+    
+    def test_old_table_layout_replaced(self, tmp_path):
+        """Test that a database with an older table layout is recreated."""
+        import sqlite3
+        
+        project = tmp_path / "project"
+        project.mkdir()
+        (project / "main.py").write_text("def main():\n    pass\n")
+        cache_dir = tmp_path / "cache"
+        cache_dir.mkdir()
+        conn = sqlite3.connect(str(cache_dir / "ast_cache.sqlite3"))
+        conn.execute("CREATE TABLE modules (path TEXT, sha TEXT, version TEXT, mtime_ns INTEGER,"
+                     " size INTEGER, blob BLOB, PRIMARY KEY (path, sha))")
+        conn.commit()
+        conn.close()
+        
+        CodeAnalyzer(str(project), cache_dir=cache_dir).analyze(depth="shallow")
+        
+        conn = sqlite3.connect(str(cache_dir / "ast_cache.sqlite3"))
+        roots = [row[0] for row in conn.execute("SELECT root FROM modules")]
+        conn.close()
+        assert roots == [str(project.resolve())]
+    
+    def test_adapter_reuses_cached_result(self, tmp_path, monkeypatch):
+        """Test that the Python adapter serves unchanged files from the cache."""
+        from code_analyzer.base_analyzer import PythonAnalyzerAdapter
+        
+        source = tmp_path / "main.py"
+        source.write_text("def main():\n    pass\n")
+        cache_dir = tmp_path / "cache"
+        
+        first = PythonAnalyzerAdapter(CodeAnalyzer(str(tmp_path), cache_dir=cache_dir))
+        assert first.analyze_file(source).functions[0].name == "main"
+        
+        analyzer = CodeAnalyzer(str(tmp_path), cache_dir=cache_dir)
+        monkeypatch.setattr(analyzer, "_analyze_file", lambda *args: pytest.fail("file reanalyzed"))
+        module_info = PythonAnalyzerAdapter(analyzer).analyze_file(source)
+        
+        assert module_info.functions[0].name == "main"
+    
+    def test_adapter_shares_analyzer_entries(self, tmp_path, monkeypatch):
+        """Test that the adapter finds entries a full analysis stored, given a relative path."""
+        from code_analyzer.base_analyzer import PythonAnalyzerAdapter
+        
+        project = tmp_path / "project"
+        project.mkdir()
+        (project / "main.py").write_text("def main():\n    pass\n")
+        cache_dir = tmp_path / "cache"
+        CodeAnalyzer(str(project), cache_dir=cache_dir).analyze(depth="shallow")
+        
+        analyzer = CodeAnalyzer(str(project), cache_dir=cache_dir)
+        monkeypatch.setattr(analyzer, "_analyze_file", lambda *args: pytest.fail("file reanalyzed"))
+        monkeypatch.chdir(project)
+        module_info = PythonAnalyzerAdapter(analyzer).analyze_file(Path("main.py"))
+        
+        assert module_info.functions[0].name == "main"
+    
+    def test_adapter_keys_on_project_root(self, tmp_path):
+        """Test that the adapter does not serve a parent project's entry to a subdirectory."""
+        from code_analyzer.base_analyzer import PythonAnalyzerAdapter
+        
+        package = tmp_path / "project" / "pkg"
+        package.mkdir(parents=True)
+        source = package / "mod.py"
+        source.write_text("def run():\n    pass\n")
+        cache_dir = tmp_path / "cache"
+        
+        parent = PythonAnalyzerAdapter(CodeAnalyzer(str(tmp_path / "project"), cache_dir=cache_dir))
+        child = PythonAnalyzerAdapter(CodeAnalyzer(str(package), cache_dir=cache_dir))
+        
+        assert parent.analyze_file(source).name == "pkg.mod"
+        assert child.analyze_file(source).name == "mod"
+        assert parent.analyze_file(source).name == "pkg.mod"
 
 
 class TestGetModuleName:
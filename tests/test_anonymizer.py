@@ -0,0 +1,140 @@
+"""Tests for code anonymization."""
+
+import ast
+from pathlib import Path
+from code_analyzer.anonymizer import CodeAnonymizer
+
+
+SOURCE = '''"""Module docstring mentioning customer_total."""
+
+import os
+
+
+class InvoiceBuilder:
+    """Builds invoices for customer_total."""
+
+    def add_line(self, customer_total, discount_rate):
+        # customer_total is never negative
+        label = "customer_total"
+        message = f"{customer_total:.2f} after {discount_rate}"
+        return os.path.join(label, message)
+'''
+
+
+def _anonymize(tmp_path, source):
+    """Anonymize a single source string and return the rewritten code."""
+    source_file = tmp_path / "module.py"
+    source_file.write_text(source)
+    anonymizer = CodeAnonymizer()
+    return anonymizer, anonymizer.anonymize_file(source_file)
+
+
+class TestReplaceIdentifiers:
+    """Tests for rewriting identifiers in source code."""
+    
+    def test_names_renamed(self, tmp_path):
+        """Test that definitions and their uses are renamed consistently."""
+        anonymizer, output = _anonymize(tmp_path, SOURCE)
+        mapping = anonymizer.name_mapping
+        
+        for name in ("InvoiceBuilder", "add_line", "discount_rate", "label"):
+            assert mapping[name] != name
+            assert f"{mapping[name]}" in output
+        assert "class InvoiceBuilder" not in output
+        assert "def add_line" not in output
+    
+    def test_preserved_names_kept(self, tmp_path):
+        """Test that builtins, stdlib modules and self are not renamed."""
+        _, output = _anonymize(tmp_path, SOURCE)
+        
+        assert "import os" in output
+        assert "return os." in output
+        assert "(self, " in output
+    
+    def test_strings_and_comments_untouched(self, tmp_path):
+        """Test that plain strings, docstrings and comments keep their text."""
+        _, output = _anonymize(tmp_path, SOURCE)
+        
+        assert '"""Module docstring mentioning customer_total."""' in output
+        assert '"""Builds invoices for customer_total."""' in output
+        assert "# customer_total is never negative" in output
+        assert ' = "customer_total"' in output
+    
+    def test_fstring_fields_renamed(self, tmp_path):
+        """Test that names inside f-string replacement fields are renamed."""
+        anonymizer, output = _anonymize(tmp_path, SOURCE)
+        mapping = anonymizer.name_mapping
+        
+        assert f"{{{mapping['customer_total']}:.2f}}" in output
+        assert f"{{{mapping['discount_rate']}}}" in output
+    
+    def test_output_parses(self, tmp_path):
+        """Test that the rewritten code is still valid Python."""
+        _, output = _anonymize(tmp_path, SOURCE)
+        
+        ast.parse(output)
+    
+    def test_colliding_names_kept_apart(self, monkeypatch):
+        """Test that identifiers whose digests collide get distinct names."""
+        monkeypatch.setattr("code_analyzer.anonymizer._NAME_DIGEST_SIZE", 1)
+        anonymizer = CodeAnonymizer()
+        identifiers = {f"name_{i}" for i in range(200)}
+        
+        anonymizer._register_identifiers(identifiers)
+        
+        anonymous = [anonymizer.name_mapping[name] for name in identifiers]
+        assert len(set(anonymous)) == len(identifiers)
+        assert any(len(name) > len("var_00") for name in anonymous)
+
+
+class TestAnonymizeProject:
+    """Tests for anonymizing whole projects."""
+    
+    def _make_project(self, root: Path):
+        """Create a small package whose modules share names."""
+        package = root / "source" / "shop"
+        package.mkdir(parents=True)
+        (package / "__init__.py").write_text("from .orders import place_order\n")
+        (package / "orders.py").write_text(
+            "from .stock import reserve_items\n\n\n"
+            "def place_order(order_items):\n"
+            "    return reserve_items(order_items)\n"
+        )
+        (package / "stock.py").write_text(
+            "def reserve_items(order_items):\n"
+            "    return [item_name for item_name in order_items]\n"
+        )
+        return root / "source"
+    
+    def _read_tree(self, root: Path):
+        """Return every file under root keyed by its relative path."""
+        return {
+            path.relative_to(root).as_posix(): path.read_text()
+            for path in sorted(root.rglob("*")) if path.is_file()
+        }
+    
+    def test_workers_give_identical_output(self, tmp_path):
+        """Test that serial and parallel runs write the same files and mapping."""
+        source = self._make_project(tmp_path)
+        
+        CodeAnonymizer().anonymize_project(source, tmp_path / "serial", workers=1)
+        CodeAnonymizer().anonymize_project(source, tmp_path / "parallel", workers=2)
+        
+        serial = self._read_tree(tmp_path / "serial")
+        assert serial == self._read_tree(tmp_path / "parallel")
+        assert "shop/orders.py" in serial
+        assert "place_order" not in serial["shop/orders.py"]
+    
+    def test_names_consistent_across_files(self, tmp_path):
+        """Test that a name defined in one file is renamed the same in another."""
+        source = self._make_project(tmp_path)
+        anonymizer = CodeAnonymizer()
+        anonymizer.anonymize_project(source, tmp_path / "out", workers=2)
+        output = self._read_tree(tmp_path / "out")
+        
+        reserve_items = anonymizer.name_mapping["reserve_items"]
+        assert f"def {reserve_items}(" in output["shop/stock.py"]
+        assert f"return {reserve_items}(" in output["shop/orders.py"]
+        for path, text in output.items():
+            if path.endswith(".py"):
+                ast.parse(text)
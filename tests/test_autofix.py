@@ -0,0 +1,257 @@
+"""Tests for automatic fix generation and application."""
+
+import ast
+import difflib
+from code_analyzer.autofix import AutoFixGenerator, CodeFix, _edits_overlap
+from code_analyzer.models import CodeLocation, Issue, IssueSeverity, IssueType
+
+
+SOURCE = '''"""Example module."""
+import os
+import sys, re  # keep this comment
+
+try:
+    import missing_module
+except ImportError:
+    pass
+
+
+def compute(value):
+    result = value * 2
+    return sys.argv
+
+
+def helper():
+    return value
+'''
+
+
+def _issue(issue_type, title, line, description=""):
+    """Build an issue in module.py."""
+    return Issue(
+        issue_type=issue_type,
+        severity=IssueSeverity.LOW,
+        title=title,
+        description=description,
+        location=CodeLocation("module.py", line, line),
+    )
+
+
+def _issues():
+    """Issues for SOURCE that each have a fix."""
+    return [
+        _issue(IssueType.UNUSED_CODE, "Unused import 'os'", 2),
+        _issue(IssueType.UNUSED_CODE, "Unused import 're'", 3),
+        _issue(IssueType.UNUSED_CODE, "Unused variable", 12, "Unused variable: 'result'"),
+        _issue(IssueType.DOCUMENTATION, "Missing docstring", 16),
+    ]
+
+
+class TestGenerateFixes:
+    """Tests for generating fixes."""
+    
+    def test_fix_per_issue(self, tmp_path):
+        """Test that every fixable issue gets a fix, in issue order."""
+        (tmp_path / "module.py").write_text(SOURCE)
+        issues = _issues()
+        
+        fixes = AutoFixGenerator().generate_fixes(issues, tmp_path)
+        
+        assert [fix.issue for fix in fixes] == issues
+    
+    def test_workers_give_same_fixes(self, tmp_path):
+        """Test that fixes generated in worker processes match serial ones."""
+        (tmp_path / "module.py").write_text(SOURCE)
+        (tmp_path / "other.py").write_text("import os\n")
+        issues = _issues() + [
+            Issue(IssueType.UNUSED_CODE, IssueSeverity.LOW, "Unused import 'os'", "",
+                  CodeLocation("other.py", 1, 1)),
+        ]
+        
+        serial = AutoFixGenerator().generate_fixes(issues, tmp_path, workers=1)
+        parallel = AutoFixGenerator().generate_fixes(issues, tmp_path, workers=2)
+        
+        assert [(f.file_path, f.edits) for f in serial] == [(f.file_path, f.edits) for f in parallel]
+    
+    def test_unused_imports_spliced(self, tmp_path):
+        """Test that import removal keeps comments and formatting elsewhere."""
+        (tmp_path / "module.py").write_text(SOURCE)
+        
+        fix = AutoFixGenerator().generate_fixes(_issues()[:1], tmp_path)[0]
+        fixed = fix.fixed_code
+        
+        assert "import os\n" not in fixed
+        assert "import sys  # keep this comment\n" in fixed
+        assert '"""Example module."""\n' in fixed
+        assert "\n\n\ndef compute(value):\n" in fixed
+        ast.parse(fixed)
+    
+    def test_emptied_block_gets_pass(self, tmp_path):
+        """Test that a block left empty by an import removal becomes pass."""
+        source = (
+            "from typing import TYPE_CHECKING\n"
+            "\n"
+            "if TYPE_CHECKING:\n"
+            "    import collections  # only for hints\n"
+            "\n"
+            "x = TYPE_CHECKING\n"
+        )
+        (tmp_path / "module.py").write_text(source)
+        issue = _issue(IssueType.UNUSED_CODE, "Unused import 'collections'", 4)
+        
+        fix = AutoFixGenerator().generate_fixes([issue], tmp_path)[0]
+        
+        assert fix.fixed_code == source.replace("import collections", "pass")
+        ast.parse(fix.fixed_code)
+    
+    def test_try_body_gets_pass(self, tmp_path):
+        """Test that an emptied try body becomes pass and still parses."""
+        (tmp_path / "module.py").write_text(SOURCE)
+        
+        fix = AutoFixGenerator().generate_fixes(_issues()[:1], tmp_path)[0]
+        
+        assert "try:\n    pass\nexcept ImportError:\n" in fix.fixed_code
+        assert "missing_module" in fix.description
+    
+    def test_form_feed_keeps_line_numbers(self, tmp_path):
+        """Test that a form feed does not shift which line is removed."""
+        source = "import os\n\x0c\nimport sys\nprint(os)\n"
+        (tmp_path / "module.py").write_text(source)
+        issue = _issue(IssueType.UNUSED_CODE, "Unused import 'sys'", 3)
+        
+        fix = AutoFixGenerator().generate_fixes([issue], tmp_path)[0]
+        
+        assert fix.fixed_code == "import os\n\x0c\nprint(os)\n"
+    
+    def test_docstring_at_body_indentation(self, tmp_path):
+        """Test that placeholder docstrings go before the body at its indentation."""
+        source = (
+            "class Greeter:\n"
+            "    def greet(self,\n"
+            "              name):\n"
+            "        return name\n"
+            "\n"
+            "\n"
+            "def shout(text): return text\n"
+        )
+        (tmp_path / "module.py").write_text(source)
+        issues = [
+            _issue(IssueType.DOCUMENTATION, "Missing docstring", 2),
+            _issue(IssueType.DOCUMENTATION, "Missing docstring", 7),
+        ]
+        
+        fixes = AutoFixGenerator().generate_fixes(issues, tmp_path)
+        
+        assert len(fixes) == 1
+        assert fixes[0].fixed_code == source.replace(
+            "        return name\n",
+            '        """TODO: Document this function."""\n        return name\n',
+        )
+        ast.parse(fixes[0].fixed_code)
+
+
+class TestCodeFix:
+    """Tests for fixes stored as line edits."""
+    
+    def test_fixed_code_applies_edits(self):
+        """Test that fixed_code applies the fix's edits to the original."""
+        fix = CodeFix(
+            issue=_issue(IssueType.UNUSED_CODE, "Unused import 'os'", 2),
+            file_path="module.py",
+            original_code="a = 1\nb = 2\nc = 3\n",
+            edits=((1, 2, ("b = 20\n",)), (3, 3, ("d = 4\n",))),
+            description="",
+            confidence="high",
+        )
+        
+        assert fix.fixed_code == "a = 1\nb = 20\nc = 3\nd = 4\n"
+    
+    def test_diff_matches_whole_file_diff(self):
+        """Test that the windowed diff equals a diff of the whole file."""
+        original = "".join(f"line_{i} = {i}\n" for i in range(60))
+        fix = CodeFix(
+            issue=_issue(IssueType.UNUSED_CODE, "Unused import 'os'", 41),
+            file_path="module.py",
+            original_code=original,
+            edits=((40, 41, ()), (45, 45, ("extra = 1\n",))),
+            description="",
+            confidence="high",
+        )
+        
+        expected = "".join(difflib.unified_diff(
+            original.splitlines(keepends=True),
+            fix.fixed_code.splitlines(keepends=True),
+            fromfile="a/module.py", tofile="b/module.py", lineterm="",
+        ))
+        assert fix.generate_diff() == expected
+        assert "@@ -38," in fix.generate_diff()
+    
+    def test_empty_fix_has_no_diff(self):
+        """Test that a fix without edits produces no diff."""
+        fix = CodeFix(
+            issue=_issue(IssueType.UNUSED_CODE, "Unused import 'os'", 1),
+            file_path="module.py",
+            original_code="a = 1\n",
+            edits=(),
+            description="",
+            confidence="high",
+        )
+        
+        assert fix.generate_diff() == ""
+
+
+class TestApplyFixes:
+    """Tests for writing fixes back to files."""
+    
+    def test_non_overlapping_fixes_merged(self, tmp_path):
+        """Test that every fix for a file lands in a single write."""
+        source_file = tmp_path / "module.py"
+        source_file.write_text(SOURCE)
+        generator = AutoFixGenerator()
+        fixes = generator.generate_fixes(_issues(), tmp_path)
+        
+        stats = generator.apply_fixes(fixes, tmp_path)
+        fixed = source_file.read_text()
+        
+        assert stats == {'applied': 4, 'failed': 0}
+        assert "import os\n" not in fixed
+        assert "import sys  # keep this comment\n" in fixed
+        assert "    _result = value * 2\n" in fixed
+        assert 'def helper():\n    """TODO: Document this function."""\n    return value\n' in fixed
+        ast.parse(fixed)
+    
+    def test_duplicate_import_fixes_applied_once(self, tmp_path):
+        """Test that unused-import fixes sharing one removal are merged once."""
+        source_file = tmp_path / "module.py"
+        source_file.write_text(SOURCE)
+        generator = AutoFixGenerator()
+        fixes = generator.generate_fixes(_issues()[:2], tmp_path)
+        assert fixes[0].edits == fixes[1].edits
+        
+        stats = generator.apply_fixes(fixes, tmp_path)
+        
+        assert stats == {'applied': 2, 'failed': 0}
+        assert source_file.read_text() == fixes[0].fixed_code
+    
+    def test_overlapping_fix_rejected(self, tmp_path):
+        """Test that a fix overlapping a more confident one is counted as failed."""
+        source_file = tmp_path / "module.py"
+        original = "a = 1\nb = 2\nc = 3\n"
+        source_file.write_text(original)
+        issue = _issue(IssueType.CODE_SMELL, "Smell", 2)
+        low = CodeFix(issue, "module.py", original, ((1, 2, ("b = 'low'\n",)),), "", "low")
+        high = CodeFix(issue, "module.py", original, ((0, 2, ("ab = 'high'\n",)),), "", "high")
+        
+        stats = AutoFixGenerator().apply_fixes([low, high], tmp_path)
+        
+        assert stats == {'applied': 1, 'failed': 1}
+        assert source_file.read_text() == "ab = 'high'\nc = 3\n"
+    
+    def test_edits_overlap(self):
+        """Test overlap rules for replacements and insertions."""
+        assert _edits_overlap((1, 3, ()), (2, 4, ()))
+        assert not _edits_overlap((1, 2, ()), (2, 3, ()))
+        assert _edits_overlap((2, 2, ("x\n",)), (2, 2, ("y\n",)))
+        assert not _edits_overlap((2, 2, ("x\n",)), (1, 2, ()))
+        assert not _edits_overlap((2, 2, ("x\n",)), (2, 3, ()))
+        assert _edits_overlap((2, 2, ("x\n",)), (1, 3, ()))
@@ -0,0 +1,60 @@
+"""Tests for the command-line interface."""
+
+import pytest
+
+click_testing = pytest.importorskip("click.testing")
+
+from code_analyzer import ast_cache
+from code_analyzer.cli import main
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Create a one-file project."""
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "main.py").write_text("def main():\n    pass\n")
+    return project
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Point the default cache directory into tmp_path."""
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(ast_cache, "DEFAULT_CACHE_DIR", cache_dir)
+    return cache_dir
+
+
+def _analyze(project, tmp_path, *args):
+    """Run the analyze command and return its output."""
+    result = click_testing.CliRunner().invoke(
+        main, ["analyze", str(project), "--depth", "shallow", "--output", str(tmp_path / "out"), *args]
+    )
+    assert result.exit_code == 0, result.output
+    return result.output
+
+
+class TestAnalyzeCache:
+    """Tests for the analyze command's result cache."""
+    
+    def test_cache_used_by_default(self, project, cache_dir, tmp_path):
+        """Test that a second run reuses the first run's results."""
+        _analyze(project, tmp_path)
+        output = _analyze(project, tmp_path)
+        
+        assert (cache_dir / "ast_cache.sqlite3").exists()
+        assert "Reusing 1 cached file results" in output
+    
+    def test_no_cache_flag(self, project, cache_dir, tmp_path):
+        """Test that --no-cache leaves the cache untouched."""
+        _analyze(project, tmp_path, "--no-cache")
+        
+        assert not cache_dir.exists()
+    
+    def test_cache_disabled_in_config(self, project, cache_dir, tmp_path):
+        """Test that analysis.cache: false in the project config disables the cache."""
+        (project / ".code-analyzer.yaml").write_text("analysis:\n  cache: false\n")
+        
+        _analyze(project, tmp_path)
+        
+        assert not cache_dir.exists()
@@ -80,6 +80,19 @@ class TestArchitectureDiagrams(unittest.TestCase):
         # Just test that generator was created successfully
         self.assertIsNotNone(self.generator)
     
+    def test_layers_and_dependencies_are_copies(self):
+        """Test that modifying returned layers or dependencies leaves diagrams intact."""
+        before = self.generator.generate_layered_architecture()
+        
+        for names in self.generator._categorize_by_layer().values():
+            names.clear()
+        for deps in self.generator._calculate_dependencies().values():
+            deps.clear()
+        self.generator._categorize_by_layer().clear()
+        
+        self.assertEqual(self.generator.generate_layered_architecture(), before)
+        self.assertEqual(self.generator._calculate_dependencies(), {"api": {"models"}})
+    
     def test_generate_layered_architecture(self):
         """Test layered architecture diagram generation."""
         diagram = self.generator.generate_layered_architecture()
@@ -87,6 +100,13 @@ class TestArchitectureDiagrams(unittest.TestCase):
         self.assertIsInstance(diagram, list)
         self.assertTrue(len(diagram) > 0)
     
+    def test_key_components_sorted_by_score(self):
+        """Test that components are ordered by classes, functions and complexity."""
+        components = self.generator._identify_key_components()
+        
+        self.assertEqual([name for name, _ in components], ["models", "api", "utils"])
+        self.assertEqual(components[0][1]["classes"], 1)
+    
     def test_format_architecture_diagrams(self):
         """Test formatting of architecture diagrams."""
         output = format_architecture_diagrams(self.modules)
@@ -11,6 +11,7 @@ from code_analyzer.tech_debt import TechDebtCalculator, DebtItem, format_tech_de
 from code_analyzer.performance import PerformanceAnalyzer, PerformanceHotspot, format_performance_report
 from code_analyzer.security import SecurityAnalyzer, DependencyIssue, format_security_report
 from code_analyzer.coverage_analysis import CoverageAnalyzer, CoverageInfo, format_coverage_report
+from code_analyzer.cicd_templates import GITHUB_ACTIONS_WORKFLOW, GITLAB_CI
 
 
 class TestQualityTrends(unittest.TestCase):
@@ -334,5 +335,51 @@ class TestCoverage(unittest.TestCase):
         self.assertIn("No coverage report found", output)
 
 
+
+class TestCICDTemplates(unittest.TestCase):
+    """Test generated CI/CD configurations."""
+    
+    def _run_gate(self, script, tmp_dir, issues_by_severity):
+        """Run the python -c quality gate embedded in a CI script."""
+        import json
+        import subprocess
+        import sys
+        
+        analysis_dir = Path(tmp_dir) / ".code-analyzer"
+        analysis_dir.mkdir(exist_ok=True)
+        (analysis_dir / "analysis.json").write_text(
+            json.dumps({"metrics": {"issues_by_severity": issues_by_severity}})
+        )
+        code = script.split('python -c "', 1)[1].rsplit('"', 1)[0]
+        return subprocess.run([sys.executable, "-c", code], cwd=tmp_dir,
+                              capture_output=True, text=True).returncode
+    
+    def test_github_quality_gate(self):
+        """Test the GitHub Actions workflow parses and its gate checks thresholds."""
+        import tempfile
+        import yaml
+        
+        workflow = yaml.safe_load(GITHUB_ACTIONS_WORKFLOW)
+        steps = workflow["jobs"]["analyze"]["steps"]
+        script = next(s["run"] for s in steps if s.get("name") == "Check for Critical Issues")
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.assertEqual(self._run_gate(script, tmp_dir, {"high": 5}), 0)
+            self.assertEqual(self._run_gate(script, tmp_dir, {"critical": 1}), 1)
+            self.assertEqual(self._run_gate(script, tmp_dir, {"high": 6}), 1)
+    
+    def test_gitlab_quality_gate(self):
+        """Test the GitLab CI config parses and its gate fails on critical issues."""
+        import tempfile
+        import yaml
+        
+        config = yaml.safe_load(GITLAB_CI)
+        script = config["quality-gate"]["script"][0]
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.assertEqual(self._run_gate(script, tmp_dir, {"high": 9}), 0)
+            self.assertEqual(self._run_gate(script, tmp_dir, {"critical": 1}), 1)
+
+
 if __name__ == "__main__":
     unittest.main()